@@ -0,0 +1,47 @@
+"""
+The candidate's base CV and cover letter, parsed once and kept up to date
+"""
+import json
+import os
+import threading
+from typing import Dict, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from models import CV, BaseCoverLetter
+
+BASE_CV_PATH = "CV.txt"
+BASE_COVER_LETTER_PATH = "Cover_Letter.txt"
+
+_documents: Dict[Tuple[str, type], Tuple[int, BaseModel]] = {}
+_documents_lock = threading.Lock()
+
+def load_document(path: str, model_cls: Type[BaseModel]) -> BaseModel:
+    """Parses and validates a JSON document, reusing it until the file changes
+
+    Raises ValueError naming the file when it is missing or invalid, so a
+    bad base document stops a run before any LLM call is made.
+    """
+    key = (os.path.abspath(path), model_cls)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError as e:
+        raise ValueError(f"Cannot read {path}: {e}") from e
+    with _documents_lock:
+        cached = _documents.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path, 'r') as file:
+            document = model_cls(**json.load(file))
+    except (OSError, ValueError, TypeError, ValidationError) as e:
+        raise ValueError(f"{path} is not a valid {model_cls.__name__}: {e}") from e
+    with _documents_lock:
+        _documents[key] = (mtime, document)
+    return document
+
+def load_base_cv(path: str = BASE_CV_PATH) -> CV:
+    return load_document(path, CV)
+
+def load_base_cover_letter(path: str = BASE_COVER_LETTER_PATH) -> BaseCoverLetter:
+    return load_document(path, BaseCoverLetter)
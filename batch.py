@@ -0,0 +1,243 @@
+"""
+Batch processing of many job postings with a bounded pool of concurrent crews
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+from tracing import format_summary, merge_summaries
+
+@dataclass
+class JobResult:
+    """Outcome of a single job posting in a batch"""
+    index: int
+    url: str
+    output_dir: str
+    success: bool
+    seconds: float
+    error: Optional[str] = None
+    task_seconds: Dict[str, float] = field(default_factory=dict)
+    tokens: int = 0
+    repairs: int = 0
+    reprompts: int = 0
+    first_artifact_seconds: Optional[float] = None
+    stages: Dict[str, dict] = field(default_factory=dict)
+
+def read_urls(lines: Iterable[str]) -> List[str]:
+    """Returns the job URLs from a stream, skipping blanks, comments and duplicates"""
+    urls = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith('#') or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
+
+def job_output_dir(output_root: str, index: int, url: str) -> str:
+    """Returns a stable, filesystem-safe output directory for a job URL"""
+    parsed = urlparse(url)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', f"{parsed.netloc}{parsed.path}").strip('-')[:60]
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(output_root, f"{index:04d}-{slug or 'job'}-{digest}")
+
+def render_error(output) -> Optional[str]:
+    """Returns the error a failed document step reported in its JSON result, if any
+
+    The document processor agent answers with the render tool's JSON, which
+    reports a failure as {"success": false, "error": ...} rather than raising.
+    """
+    match = re.search(r'\{.*\}', output if isinstance(output, str) else '', re.S)
+    if match is None:
+        return None
+    try:
+        report = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if isinstance(report, dict) and report.get('success') is False:
+        return report.get('error') or "document rendering failed"
+    return None
+
+_worker = threading.local()
+
+def worker_crew(use_document_agent: bool = False):
+    """Returns this worker thread's crew, so agents are built once per worker"""
+    from job_application_agents import JobApplicationCrew
+
+    crew = getattr(_worker, 'crew', None)
+    if crew is None or crew.use_document_agent != use_document_agent:
+        crew = _worker.crew = JobApplicationCrew(use_document_agent=use_document_agent)
+    return crew
+
+def run_job(index: int, url: str, output_root: str, verbose: bool = False,
+            use_document_agent: bool = False, refresh: bool = False,
+            resume: bool = False) -> JobResult:
+    """Runs the application crew for one job posting and records its timing"""
+    output_dir = job_output_dir(output_root, index, url)
+    crew = None
+    start = time.perf_counter()
+    try:
+        crew = worker_crew(use_document_agent)
+        output = crew.run(url, output_dir, verbose=verbose, refresh=refresh, resume=resume)
+        error = render_error(output)
+        if error is not None:
+            raise RuntimeError(f"Rendering documents failed: {error}")
+        result = JobResult(index, url, output_dir, True, time.perf_counter() - start)
+    except Exception as e:
+        result = JobResult(index, url, output_dir, False, time.perf_counter() - start, str(e))
+    if crew is not None:
+        result.task_seconds = {t.name: round(t.seconds, 3) for t in crew.task_timings}
+        result.tokens = crew.token_usage.get('total_tokens', 0)
+        result.repairs = sum(len(r.repairs) for r in crew.output_reports.values())
+        result.reprompts = sum(r.reprompts for r in crew.output_reports.values())
+        result.stages = crew.trace_summary
+        if crew.first_artifact_seconds is not None:
+            result.first_artifact_seconds = round(crew.first_artifact_seconds, 3)
+    return result
+
+def run_batch(urls: List[str], output_root: str, max_workers: int = 4,
+              verbose: bool = False, use_document_agent: bool = False,
+              refresh: bool = False, resume: bool = False,
+              indices: Optional[List[int]] = None) -> List[JobResult]:
+    """Processes job URLs concurrently with at most max_workers crews in flight
+
+    indices are the URLs' positions in the original list, which keep their
+    output folders stable when only some of the URLs are processed.
+    """
+    os.makedirs(output_root, exist_ok=True)
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_job, index, url, output_root, verbose, use_document_agent, refresh, resume)
+            for index, url in zip(indices or range(len(urls)), urls)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "ok" if result.success else f"failed: {result.error}"
+            print(f"[{result.index:04d}] {result.seconds:7.1f}s {result.url} ({status})")
+            results.append(result)
+    return sorted(results, key=lambda r: r.index)
+
+def write_summary(results: List[JobResult], output_root: str, wall_seconds: float) -> dict:
+    """Writes summary.json for a batch and returns it"""
+    succeeded = [r for r in results if r.success]
+    first_artifacts = [r.first_artifact_seconds for r in results if r.first_artifact_seconds is not None]
+    summary = {
+        "jobs": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "wall_seconds": round(wall_seconds, 3),
+        "job_seconds_total": round(sum(r.seconds for r in results), 3),
+        "tokens_total": sum(r.tokens for r in results),
+        "repairs_total": sum(r.repairs for r in results),
+        "reprompts_total": sum(r.reprompts for r in results),
+        "first_artifact_seconds_mean": (round(sum(first_artifacts) / len(first_artifacts), 3)
+                                        if first_artifacts else None),
+        "stages": merge_summaries(r.stages for r in results),
+        "results": [asdict(r) for r in results]
+    }
+    with open(os.path.join(output_root, "summary.json"), 'w') as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+def prefilter(urls: List[str], output_root: str, cv_path: str, top: Optional[int],
+              min_score: Optional[float], concurrency: int) -> list:
+    """Ranks postings against the base CV and returns those worth applying to
+
+    The full ranking is written to ranking.json next to the batch summary.
+    """
+    from ranking import load_profile, rank_postings, select_postings
+
+    print(f"Ranking {len(urls)} job postings against {cv_path}")
+    ranked = rank_postings(urls, load_profile(cv_path), concurrency=max(concurrency * 2, 8))
+    selected = select_postings(ranked, top, min_score)
+    chosen = {posting.url for posting in selected}
+
+    os.makedirs(output_root, exist_ok=True)
+    with open(os.path.join(output_root, "ranking.json"), 'w') as file:
+        json.dump([dict(asdict(posting), selected=posting.url in chosen) for posting in ranked], file, indent=2)
+    for posting in ranked:
+        mark = "*" if posting.url in chosen else " "
+        detail = f"failed: {posting.error}" if posting.error else f"{posting.title} at {posting.company}"
+        print(f" {mark} {posting.score:5.3f} {posting.url} ({detail})")
+    return selected
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tailor applications for a list of job posting URLs")
+    parser.add_argument("urls", nargs="?", default="-",
+                        help="File with one job URL per line, or '-' to read from stdin")
+    parser.add_argument("-o", "--output", default="output",
+                        help="Root directory for per-job output folders")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="Maximum number of crews to run concurrently")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Show agent output for every crew")
+    parser.add_argument("--document-agent", action="store_true",
+                        help="Render documents through the LLM document processor agent")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached job pages and LLM responses")
+    parser.add_argument("--top", type=int,
+                        help="Only apply to the N postings that best match the base CV")
+    parser.add_argument("--min-score", type=float,
+                        help="Only apply to postings whose match score is at least this (0-1)")
+    parser.add_argument("--cv", default="CV.txt", help="Base CV used to rank postings")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue each job from the task outputs saved by the last batch run")
+    args = parser.parse_args(argv)
+
+    if args.urls == "-":
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.urls, 'r') as file:
+            urls = read_urls(file)
+
+    if not urls:
+        print("No job URLs to process")
+        return 1
+
+    # Every job starts from the same base documents, so check them once up front
+    from base_documents import load_base_cv, load_base_cover_letter
+    try:
+        load_base_cv()
+        load_base_cover_letter()
+    except ValueError as e:
+        print(e)
+        return 1
+
+    start = time.perf_counter()
+    indices = None
+    if args.top is not None or args.min_score is not None:
+        positions = {url: index for index, url in enumerate(urls)}
+        selected = prefilter(urls, args.output, args.cv, args.top, args.min_score, args.jobs)
+        urls = [posting.url for posting in selected]
+        indices = [positions[url] for url in urls]
+        if not urls:
+            print("No postings passed the relevance filter")
+            return 1
+
+    print(f"Processing {len(urls)} job postings with {args.jobs} workers")
+    results = run_batch(urls, args.output, max_workers=args.jobs, verbose=args.verbose,
+                        use_document_agent=args.document_agent, refresh=args.refresh,
+                        resume=args.resume, indices=indices)
+    summary = write_summary(results, args.output, time.perf_counter() - start)
+
+    print(f"\nCompleted {summary['succeeded']}/{summary['jobs']} jobs "
+          f"in {summary['wall_seconds']:.1f}s (sequential estimate {summary['job_seconds_total']:.1f}s)")
+    for result in results:
+        if not result.success:
+            print(f"  FAILED {result.url}: {result.error}")
+    print(format_summary(summary['stages']))
+    print(f"Summary written to {os.path.join(args.output, 'summary.json')}")
+    return 0 if summary['failed'] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
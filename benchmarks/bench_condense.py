@@ -0,0 +1,147 @@
+"""
+Benchmark job description condensing: tokens sent to the LLM before and after
+
+Usage: python benchmarks/bench_condense.py [--sizes 5 20 80] [--budget 1500]
+                                           [--prefill-rate 5000] [--skip-applications]
+
+Builds job board pages with navigation, cookie banners, repeated blocks and
+long benefit and legal sections around the requirements, then compares the
+description the crawler tool used to return with the condensed one.
+
+It then runs whole applications offline, against the local job board and
+the stub LLM of bench_suite.py, once with the raw description and once
+with the condensed one. The stub charges prefill time per prompt token, so
+the per-application latency reflects the tokens saved.
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+from unittest import mock
+
+from offline import ROOT, WORKDIR, cleanup, use_stub_llm
+
+# Rendered documents are not reused, so both variants do the same work apart
+# from the LLM prompts
+os.environ['JOB_RENDER_CACHE_MAX_MB'] = '0'
+
+from condense import clean_lines, condense_description, count_tokens, split_sections
+from extraction import extract_job_details
+
+# Bullets that start like boilerplate but belong to the posting
+BULLETS = [
+    "Apply machine learning techniques to real-world problems",
+    "Share knowledge with junior engineers through code reviews",
+    "Sign up customers for pilots and gather their feedback",
+    "Powered by curiosity, you dig into problems across the stack",
+]
+# Title Case bullets that mention heading words without being headings
+SKILL_BULLETS = ["Experience with Python", "Strong Communication Skills", "Python Experience Required"]
+# Lines that clean_lines should drop
+BOILERPLATE_LINES = [
+    "Apply now", "Apply Now »", "Share this job", "Sign in", "Powered by Greenhouse",
+    "Accept all cookies", "Privacy policy", "© 2024 Example Corp. All rights reserved.",
+]
+
+def synthetic_posting(filler: int) -> str:
+    """A job page whose requirements are buried between filler sections"""
+    nav = ''.join(f"<li><a href='#'>{label}</a></li>" for label in
+                  ("Sign in", "Back to jobs", "Share this job", "Save job", "Apply now"))
+    about = ''.join(f"<p>Our company story, part {i}, told at length for candidates.</p>" for i in range(filler))
+    benefits = ''.join(f"<li>Benefit number {i} with a generous description</li>" for i in range(filler))
+    legal = "<p>We are an equal opportunity employer and value diversity at our company.</p>" * 3
+    requirements = ''.join(f"<li>Requirement {i}: experience with distributed system {i}</li>" for i in range(8))
+    duties = ''.join(f"<li>Responsibility {i}: build and operate service {i}</li>" for i in range(8))
+    return (
+        "<html><body>"
+        f"<nav><ul>{nav}</ul></nav>"
+        "<div class='cookie-banner'><p>We use cookies to improve your experience.</p>"
+        "<button>Accept all cookies</button></div>"
+        "<main><div>"
+        f"<h2>About us</h2>{about}"
+        f"<h2>Responsibilities</h2><ul>{duties}</ul>"
+        f"<h2>Requirements</h2><ul>{requirements}</ul>"
+        f"<h2>Benefits</h2><ul>{benefits}</ul>"
+        f"{legal}"
+        "</div></main>"
+        f"<footer><p>Apply now</p><p>© 2024 Example Corp. All rights reserved.</p>"
+        "<p>Privacy policy</p></footer>"
+        "</body></html>"
+    )
+
+def application_latency(layouts, prefill_rate: float, latency: float):
+    """Runs one application per layout with and without condensing and prints their latency"""
+    import job_application_agents
+    from job_application_agents import JobApplicationCrew
+    from job_board import JobBoard
+
+    # No LLM cache, so both variants pay for every call
+    use_stub_llm(latency=latency, seconds_per_prompt_token=1 / prefill_rate)
+    crew = JobApplicationCrew()
+
+    def run(url, output_dir, condense):
+        patch = (contextlib.nullcontext() if condense else
+                 mock.patch.object(job_application_agents, 'condense_description', lambda text: text))
+        start = time.perf_counter()
+        with patch, contextlib.redirect_stdout(io.StringIO()):
+            crew.run(url, output_dir, verbose=False)
+        return time.perf_counter() - start
+
+    print(f"\nper application, {prefill_rate:.0f} prompt tokens/s prefill, {latency:.2f}s per call")
+    print(f"{'layout':<8} {'raw tok':>8} {'raw s':>7} {'cond tok':>9} {'cond s':>7} {'saved':>7}")
+    with JobBoard() as board:
+        # Starts the render workers and fills the HTTP cache outside the timings
+        run(board.url('small', 999), os.path.join(WORKDIR, 'warm-up'), True)
+        for number, layout in enumerate(layouts):
+            url = board.url(layout, number)
+            before = run(url, os.path.join(WORKDIR, layout, 'raw'), condense=False)
+            before_tokens = crew.token_usage['prompt_tokens']
+            after = run(url, os.path.join(WORKDIR, layout, 'condensed'), condense=True)
+            after_tokens = crew.token_usage['prompt_tokens']
+            assert after_tokens <= before_tokens, "condensing should never add prompt tokens"
+            print(f"{layout:<8} {before_tokens:>8} {before:>7.2f} {after_tokens:>9} {after:>7.2f} "
+                  f"{1 - after / before:>6.0%}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 80],
+                        help="Filler paragraphs and benefits per page")
+    parser.add_argument("--budget", type=int, default=1500, help="Token budget for the description")
+    parser.add_argument("--prefill-rate", type=float, default=5000,
+                        help="Prompt tokens per second the stub LLM reads")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fixed seconds per stub LLM call")
+    parser.add_argument("--skip-applications", action="store_true",
+                        help="Only compare tokens, without running whole applications")
+    args = parser.parse_args(argv)
+
+    try:
+        # Load the tokenizer before timing anything
+        count_tokens("warm up")
+        kept = clean_lines('\n'.join(BULLETS + BOILERPLATE_LINES))
+        assert kept == BULLETS, f"only the boilerplate lines should be dropped: {kept}"
+        headings = [heading for heading, _ in split_sections(["Requirements"] + SKILL_BULLETS + ["What You'll Do"])]
+        assert headings == ["Requirements", "What You'll Do"], f"bullets should not start sections: {headings}"
+
+        print(f"{'filler':>6} {'raw tok':>8} {'condensed':>10} {'saved':>7} {'ms':>7}")
+        for size in args.sizes:
+            description = extract_job_details(synthetic_posting(size))['description']
+            start = time.perf_counter()
+            condensed = condense_description(description, args.budget)
+            seconds = time.perf_counter() - start
+            # The requirements must survive no matter how much filler surrounds them
+            assert all(f"Requirement {i}:" in condensed and f"Responsibility {i}:" in condensed for i in range(8))
+            before, after = count_tokens(description), count_tokens(condensed)
+            print(f"{size:>6} {before:>8} {after:>10} {1 - after / before:>6.0%} {seconds * 1000:>7.1f}")
+
+        if not args.skip_applications:
+            from job_board import LAYOUTS
+
+            # Templates and base documents are read relative to the repo
+            os.chdir(ROOT)
+            application_latency(LAYOUTS, args.prefill_rate, args.latency)
+    finally:
+        cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark the description fallback: max() over every block vs the single-pass extractor
+
+Usage: python benchmarks/bench_extraction.py [--sizes 200 1000 4000] [--parser html.parser]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+import extraction
+
+def synthetic_page(sections: int, depth: int = 30) -> str:
+    """Builds an ATS-style page with deeply nested wrappers around many sections"""
+    body = []
+    for i in range(sections):
+        items = ''.join(f"<li>Requirement {i}.{j}: experience with system {j}</li>" for j in range(5))
+        body.append(
+            f"<section class='block-{i}'><div><h3>Section {i}</h3>"
+            f"<p>Paragraph text for section {i} describing the team and the role.</p>"
+            f"<ul>{items}</ul></div></section>"
+        )
+    content = ''.join(body)
+    for level in range(depth):
+        content = f"<div class='wrapper-{level}'>{content}</div>"
+    nav = ''.join(f"<div class='nav-item'><a href='#'>Link {i}</a></div>" for i in range(50))
+    return f"<html><body><nav>{nav}</nav><main>{content}</main><footer><div>Footer</div></footer></body></html>"
+
+def old_fallback(soup):
+    content_blocks = soup.find_all(['div', 'section', 'article'])
+    return max(content_blocks, key=lambda x: len(x.text.strip()))
+
+# Blocks whose text differs only in the kinds of strings Tag.text skips or keeps
+EDGE_CASES = (
+    "<div>short</div><div><![CDATA[" + "cdata " * 40 + "]]></div>",
+    "<div>short text</div><div><!-- " + "comment " * 40 + "--></div>",
+    "<div>short text</div><div><script>" + "var x = 1; " * 40 + "</script></div>",
+    "<div>short text</div><div><style>" + "p { margin: 0 } " * 40 + "</style></div>",
+    "<div>short text</div><div><?php " + "echo 1; " * 40 + "?></div>",
+    "<div>short text</div><div><template>" + "template " * 40 + "</template></div>",
+)
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--depth", type=int, default=30, help="Wrapper divs around the content")
+    parser.add_argument("--parser", default=extraction.PARSER)
+    args = parser.parse_args(argv)
+
+    for html in EDGE_CASES:
+        soup = BeautifulSoup(html, args.parser)
+        assert old_fallback(soup) is extraction.largest_text_block(soup), html[:40]
+
+    print(f"parser: {args.parser}")
+    print(f"{'sections':>8} {'html KB':>8} {'old ms':>10} {'new ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        html = synthetic_page(size, args.depth)
+        soup = BeautifulSoup(html, args.parser)
+        assert old_fallback(soup) is extraction.largest_text_block(soup)
+        old = time_call(old_fallback, soup)
+        new = time_call(extraction.largest_text_block, soup)
+        print(f"{size:>8} {len(html) / 1024:>8.0f} {old * 1000:>10.1f} {new * 1000:>10.1f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark the HTTP response cache against a local server that answers conditional requests
+
+Usage: python benchmarks/bench_fetching.py [--pages 20] [--latency 0.05]
+
+The server stands in for a job board: it delays every response, sends an
+ETag and Last-Modified for each page and answers 304 Not Modified when the
+client's validators still match. Besides the cold/warm timings the run
+checks that fresh entries skip the network, stale entries are revalidated
+with both validators, changed pages are stored again, refresh bypasses the
+cache and storing responses sweeps out expired entries.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fetching import Fetcher, ResponseCache
+
+class ConditionalServer:
+    """Serves /<n>.html with validators from a background thread on a free local port
+
+    Every request is recorded as (path, status, request headers) in
+    ``requests``. ``versions`` bumps a page's content and validators.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = []
+        self.versions = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency)
+                version = server.versions.get(self.path, 0)
+                body = f"<html><body><h1>Posting {self.path} v{version}</h1></body></html>".encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                last_modified = formatdate(1700000000 + version, usegmt=True)
+                status = 304 if self.headers.get('If-None-Match') == etag else 200
+                with server._lock:
+                    server.requests.append((self.path, status, dict(self.headers)))
+                self.send_response(status)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                if status == 304:
+                    self.end_headers()
+                    return
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='conditional-server', daemon=True)
+
+    def url(self, number: int) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{number}.html"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def timed_pass(fetcher, urls, **kwargs):
+    start = time.perf_counter()
+    results = [fetcher.fetch(url, **kwargs) for url in urls]
+    return time.perf_counter() - start, results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20, help="Distinct pages per pass")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the server waits per response")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp()
+    try:
+        with ConditionalServer(args.latency) as server:
+            cache = ResponseCache(directory, ttl=3600)
+            fetcher = Fetcher(cache=cache)
+            urls = [server.url(i) for i in range(args.pages)]
+
+            cold, results = timed_pass(fetcher, urls)
+            assert len(server.requests) == args.pages
+            assert not any(r.from_cache for r in results), "the first pass should go to the network"
+
+            warm, results = timed_pass(fetcher, urls)
+            assert len(server.requests) == args.pages, "fresh entries should be served without a request"
+            assert all(r.from_cache and not r.revalidated for r in results)
+
+            cache.ttl = 0
+            stale, results = timed_pass(fetcher, urls)
+            revalidations = server.requests[args.pages:]
+            assert [status for _, status, _ in revalidations] == [304] * args.pages, \
+                "stale entries should be revalidated and answered with 304"
+            assert all('If-None-Match' in headers and 'If-Modified-Since' in headers
+                       for _, _, headers in revalidations), "both validators should be sent"
+            assert all(r.from_cache and r.revalidated for r in results)
+            assert all('v0' in r.text for r in results)
+
+            server.versions['/0.html'] = 1
+            result = fetcher.fetch(urls[0])
+            assert server.requests[-1][1] == 200 and not result.from_cache and 'v1' in result.text, \
+                "a changed page should be fetched and stored again"
+            result = fetcher.fetch(urls[0])
+            assert result.revalidated and 'v1' in result.text, "the new version should replace the cached one"
+
+            cache.ttl = 3600
+            requests = len(server.requests)
+            result = fetcher.fetch(urls[1], refresh=True)
+            assert len(server.requests) == requests + 1 and not result.from_cache, \
+                "refresh should skip the cache"
+
+            # Storing a response sweeps once the interval has passed
+            cache.max_age, cache.evict_interval = 0, 0
+            time.sleep(0.01)
+            fetcher.fetch(urls[2], refresh=True)
+            entries = os.listdir(os.path.join(directory, 'entries'))
+            bodies = os.listdir(os.path.join(directory, 'bodies'))
+            assert len(entries) <= 1 and len(bodies) <= 1, \
+                f"expired entries should be evicted, {len(entries)} entries and {len(bodies)} bodies left"
+
+            cache.max_age, cache.evict_interval = 3600, 3600
+            fetcher.fetch(urls[3], refresh=True)
+            fetcher.fetch(urls[4], refresh=True)
+            assert len(os.listdir(os.path.join(directory, 'entries'))) >= 2, \
+                "sweeps should be throttled to the evict interval"
+
+        print(f"{'pass':<11} {'seconds':>8} {'ms/page':>8}")
+        for name, seconds in (('cold', cold), ('fresh', warm), ('revalidate', stale)):
+            print(f"{name:<11} {seconds:>8.2f} {seconds / args.pages * 1000:>8.1f}")
+        print("cache checks passed")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
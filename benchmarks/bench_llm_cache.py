@@ -0,0 +1,82 @@
+"""
+Benchmark the LLM response cache offline against a stub chat model
+
+Usage: python benchmarks/bench_llm_cache.py [--prompts 20] [--latency 0.5]
+
+The stub answers after a fixed delay standing in for an API round trip and
+counts how often it is really called. Besides the miss/hit timings the run
+checks that a changed job posting, a refresh, expiry and size eviction all
+behave as expected.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from llm_cache import LLMCache, cache_scope, job_content_key
+
+class StubChatModel(FakeListChatModel):
+    """Fake chat model that sleeps like a remote call and counts real calls"""
+    latency: float = 0.0
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return super()._call(*args, **kwargs)
+
+def timed_pass(llm, prompts, **scope) -> float:
+    start = time.perf_counter()
+    with cache_scope(**scope):
+        for prompt in prompts:
+            llm.invoke(prompt)
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=20, help="Distinct prompts per pass")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per stub LLM call")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp()
+    try:
+        cache = LLMCache(os.path.join(directory, 'llm.sqlite3'))
+        llm = StubChatModel(responses=["Final Answer: {}"], latency=args.latency, cache=cache)
+        prompts = [f"Tailor section {i} of the CV for the posting" for i in range(args.prompts)]
+        job = job_content_key("Senior Python Developer at Example Corp")
+
+        cold = timed_pass(llm, prompts, job_key=job)
+        warm = timed_pass(llm, prompts, job_key=job)
+        assert llm.calls == args.prompts, "warm pass should be served from the cache"
+
+        timed_pass(llm, prompts[:1], job_key=job_content_key("The posting changed"))
+        assert llm.calls == args.prompts + 1, "a changed posting should miss"
+
+        timed_pass(llm, prompts[:1], job_key=job, refresh=True)
+        assert llm.calls == args.prompts + 2, "refresh should skip the lookup"
+
+        cache.ttl = 0
+        timed_pass(llm, prompts[:1], job_key=job)
+        assert llm.calls == args.prompts + 3, "expired entries should miss"
+
+        cache.ttl, cache.max_bytes = 3600, 0
+        cache.evict()
+        timed_pass(llm, prompts[:1], job_key=job)
+        assert llm.calls == args.prompts + 4, "evicted entries should miss"
+
+        print(f"{'pass':<6} {'seconds':>8} {'ms/call':>8}")
+        print(f"{'cold':<6} {cold:>8.2f} {cold / args.prompts * 1000:>8.1f}")
+        print(f"{'warm':<6} {warm:>8.2f} {warm / args.prompts * 1000:>8.1f}")
+        print(f"cache checks passed, {cache.stats()}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
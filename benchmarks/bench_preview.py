@@ -0,0 +1,116 @@
+"""
+Benchmark JPEG preview generation: time and peak RSS per preview
+
+Usage: python benchmarks/bench_preview.py [--pages 1 5 20] [--pdf file.pdf] [--dpi 200]
+
+Each measurement runs in a fresh interpreter so peak RSS is not shared
+between modes. The poppler subprocess used by pdf2image is reported as
+child RSS.
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ('legacy', 'pdf2image', 'pdfium')
+
+def synthetic_pdf(pages: int) -> bytes:
+    """Builds a letter-size PDF, laid out by WeasyPrint when it is available"""
+    try:
+        from weasyprint import HTML
+        body = ''.join(
+            f"<section style='page-break-after: always'><h1>Page {i}</h1>"
+            + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>" * 40
+            + "</section>"
+            for i in range(pages)
+        )
+        return HTML(string=f"<html><body>{body}</body></html>").write_pdf()
+    except (ImportError, OSError):
+        from PIL import Image, ImageDraw
+        images = []
+        for i in range(pages):
+            image = Image.new('RGB', (612, 792), 'white')
+            ImageDraw.Draw(image).text((72, 72), f"Page {i}", fill='black')
+            images.append(image)
+        buffer = io.BytesIO()
+        images[0].save(buffer, 'PDF', save_all=True, append_images=images[1:], resolution=72)
+        return buffer.getvalue()
+
+def run_child(mode: str, pdf_path: str, dpi: int):
+    """Renders one preview in this process and prints its measurements as JSON"""
+    from pdf2image import convert_from_bytes
+    from preview import render_preview
+
+    with open(pdf_path, 'rb') as file:
+        pdf = file.read()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    jpg_path = os.path.join(tempfile.mkdtemp(), 'preview.jpg')
+
+    start = time.perf_counter()
+    if mode == 'legacy':
+        images = convert_from_bytes(pdf)
+        if images:
+            images[0].save(jpg_path, 'JPEG', quality=95)
+    else:
+        render_preview(pdf, jpg_path, dpi=dpi, backend=mode)
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'seconds': seconds,
+        'rss_delta_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+        'child_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }))
+
+def measure(mode: str, pdf_path: str, dpi: int):
+    completed = subprocess.run(
+        [sys.executable, __file__, '--child', mode, pdf_path, '--dpi', str(dpi)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--pdf", help="Benchmark an existing PDF instead of synthetic ones")
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.dpi)
+        return
+
+    if args.pdf:
+        documents = [(args.pdf, os.path.basename(args.pdf))]
+    else:
+        documents = []
+        for pages in args.pages:
+            fd, path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(synthetic_pdf(pages))
+            documents.append((path, f"{pages} pages"))
+
+    print(f"{'document':<12} {'mode':<10} {'ms':>9} {'RSS MB':>8} {'child MB':>9}")
+    for path, label in documents:
+        for mode in MODES:
+            result = measure(mode, path, args.dpi)
+            if result is None:
+                print(f"{label:<12} {mode:<10} {'unavailable':>9}")
+                continue
+            print(f"{label:<12} {mode:<10} {result['seconds'] * 1000:>9.1f} "
+                  f"{result['rss_delta_mb']:>8.1f} {result['child_rss_mb']:>9.1f}")
+        if not args.pdf:
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
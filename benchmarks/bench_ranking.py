@@ -0,0 +1,126 @@
+"""
+Benchmark TF-IDF pre-ranking of many postings against the base CV
+
+Usage: python benchmarks/bench_ranking.py [--postings 1000 5000] [--words 400]
+
+Indexing is the per-posting tokenizing done as pages are scraped; scoring is
+the batch step that ranks every indexed posting at once. Before timing, the
+vectorized scores are checked against a straightforward TF-IDF
+implementation, and rank_postings and select_postings are checked against
+the local job board.
+"""
+import argparse
+import collections
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp(prefix='job-bench-ranking-')
+os.environ.setdefault('JOB_FETCH_CACHE_DIR', os.path.join(WORKDIR, 'http'))
+
+from ranking import PostingIndex, load_profile, rank_postings, select_postings, tokenize
+
+FILLER = ("team culture growth customer product mission values office remote benefits "
+          "collaborate fast paced environment passionate stakeholders deliver impact").split()
+
+def synthetic_postings(count: int, words: int, skills: list, seed: int = 0) -> list:
+    """Postings mixing filler with a random share of the CV's own terms"""
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(count):
+        share = rng.random() * 0.3
+        postings.append(' '.join(
+            rng.choice(skills) if rng.random() < share else rng.choice(FILLER)
+            for _ in range(words)
+        ))
+    return postings
+
+def reference_scores(postings: list, profile: str) -> list:
+    """TF-IDF cosine similarity one posting at a time, with the same weighting as PostingIndex"""
+    counts = [collections.Counter(tokenize(posting)) for posting in postings]
+    frequency = collections.Counter(term for posting in counts for term in posting)
+    idf = {term: math.log((1 + len(postings)) / (1 + df)) + 1 for term, df in frequency.items()}
+    query = {term: (1 + math.log(count)) * idf[term]
+             for term, count in collections.Counter(tokenize(profile)).items() if term in idf}
+    query_norm = math.sqrt(sum(weight ** 2 for weight in query.values()))
+    scores = []
+    for posting in counts:
+        weights = {term: (1 + math.log(count)) * idf[term] for term, count in posting.items()}
+        norm = math.sqrt(sum(weight ** 2 for weight in weights.values()))
+        dot = sum(weight * query.get(term, 0.0) for term, weight in weights.items())
+        scores.append(dot / (norm * query_norm) if norm and query_norm else 0.0)
+    return scores
+
+def check_scores(profile: str, skills: list):
+    """Compares PostingIndex with the reference on postings ending in the CV itself, an unrelated and an empty one"""
+    postings = synthetic_postings(200, 100, skills, seed=1) + [profile, 'zebra quokka marmalade', '']
+    index = PostingIndex()
+    for posting in postings:
+        index.add(posting)
+    scores = index.scores(profile)
+    expected = reference_scores(postings, profile)
+    assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(scores, expected)), \
+        "vectorized scores should match the reference TF-IDF"
+    assert scores.argmax() == 200, "the CV's own text should rank first"
+    assert scores[201] == 0.0 and scores[202] == 0.0, "postings without CV terms should score 0"
+
+def check_ranking(profile: str):
+    """Ranks job board postings plus one that cannot be fetched"""
+    from job_board import JobBoard
+
+    with JobBoard() as board:
+        missing = board.url('small', 0).replace('/small/', '/missing/')
+        urls = [board.url(layout, number) for number in range(3) for layout in ('small', 'medium')]
+        ranked = rank_postings([missing] + urls, profile)
+        scores = [posting.score for posting in ranked if posting.error is None]
+        assert scores == sorted(scores, reverse=True), "postings should be ranked best first"
+        assert ranked[-1].url == missing and ranked[-1].error, "failed fetches should sort last"
+        assert all(posting.title and posting.company for posting in ranked[:-1])
+
+        requests = board.requests
+        assert [posting.url for posting in select_postings(ranked, top=2)] == [p.url for p in ranked[:2]]
+        threshold = ranked[2].score
+        selected = select_postings(ranked, min_score=threshold)
+        assert selected and all(posting.score >= threshold for posting in selected)
+        assert missing not in [posting.url for posting in select_postings(ranked, min_score=0)], \
+            "failed fetches should never be selected"
+        # Ranked pages are in the HTTP cache for the crew to reuse
+        rank_postings(urls, profile)
+        assert board.requests == requests, "ranking again should be served from the HTTP cache"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--postings", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--words", type=int, default=400, help="Words per posting")
+    args = parser.parse_args(argv)
+
+    profile = load_profile(os.path.join(ROOT, 'CV.txt'))
+    skills = sorted(set(tokenize(profile)))
+    try:
+        check_scores(profile, skills)
+        check_ranking(profile)
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+    print("ranking checks passed")
+    print(f"{'postings':>8} {'index ms/posting':>17} {'score s':>8} {'best':>6}")
+    for count in args.postings:
+        postings = synthetic_postings(count, args.words, skills)
+        index = PostingIndex()
+        start = time.perf_counter()
+        for posting in postings:
+            index.add(posting)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        scores = index.scores(profile)
+        scored = time.perf_counter() - start
+        print(f"{count:>8} {indexed / count * 1000:>17.3f} {scored:>8.3f} {scores.max():>6.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark the render cache: full renders vs artifacts restored for unchanged data
+
+Usage: python benchmarks/bench_render_cache.py [--repeat 5] [--workers 1]
+
+Renders the sample CV and cover letter cold, then again with the same data,
+and checks that unchanged inputs are restored without rendering while a
+changed model, changed render settings or an evicted entry render again,
+and that a failure to store a render still delivers its result.
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp()
+os.environ['JOB_RENDER_CACHE_DIR'] = os.path.join(WORKDIR, 'render-cache')
+
+from base_documents import load_base_cv, load_base_cover_letter
+from render_cache import get_render_cache
+from rendering import COVER_LETTER_TEMPLATE_PATH, CV_TEMPLATE_PATH, render_model
+from render_pool import RenderPool
+import render_pool
+
+def render_pair(cv, cover_letter, output_dir: str, **settings):
+    """Renders both documents and returns their RenderResults"""
+    return [
+        render_model(cv, CV_TEMPLATE_PATH, os.path.join(output_dir, 'cv.pdf'),
+                     os.path.join(output_dir, 'cv.jpg'), **settings),
+        render_model(cover_letter, COVER_LETTER_TEMPLATE_PATH, os.path.join(output_dir, 'cover_letter.pdf'),
+                     os.path.join(output_dir, 'cover_letter.jpg'), **settings)
+    ]
+
+def timed_pairs(cv, cover_letter, repeat: int, prefix: str):
+    """Renders the pair into repeat fresh folders, returning seconds per document and the results"""
+    results = []
+    start = time.perf_counter()
+    for i in range(repeat):
+        output_dir = os.path.join(WORKDIR, f"{prefix}-{i}")
+        os.makedirs(output_dir)
+        results += render_pair(cv, cover_letter, output_dir)
+    return (time.perf_counter() - start) / len(results), results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Cached renders of the pair to time")
+    parser.add_argument("--workers", type=int, default=1, help="Render pool size; 0 renders inline")
+    args = parser.parse_args(argv)
+
+    # Templates and the shared stylesheet are referenced relative to the repo
+    os.chdir(ROOT)
+    render_pool._render_pool = RenderPool(args.workers)
+    try:
+        cache = get_render_cache()
+        cv, cover_letter = load_base_cv(), load_base_cover_letter()
+
+        cold, results = timed_pairs(cv, cover_letter, 1, 'cold')
+        assert not any(result.cached for result in results), "the first render should miss"
+
+        warm, results = timed_pairs(cv, cover_letter, args.repeat, 'warm')
+        assert all(result.cached for result in results), "unchanged inputs should be restored"
+        assert all(os.path.getsize(result.pdf_path) and os.path.getsize(result.jpg_path) for result in results)
+        assert cache.stats()['hits'] == 2 * args.repeat
+
+        changed = cv.model_copy(update={'job_title': 'Principal Engineer'})
+        results = render_pair(changed, cover_letter, os.path.join(WORKDIR, 'cold-0'))
+        assert [result.cached for result in results] == [False, True], "only the changed model should render"
+
+        results = render_pair(cv, cover_letter, os.path.join(WORKDIR, 'cold-0'), preview_dpi=72)
+        assert not any(result.cached for result in results), "changed render settings should miss"
+
+        cache.max_bytes = 0
+        cache.evict()
+        cache.max_bytes = 256 * 1024 * 1024
+        results = render_pair(cv, cover_letter, os.path.join(WORKDIR, 'cold-0'))
+        assert not any(result.cached for result in results), "evicted entries should render again"
+
+        def failing_store(*args, **kwargs):
+            raise OSError("disk full")
+
+        cache.store = failing_store
+        # The store failures are expected here, so keep their warnings out of the report
+        logging.getLogger('rendering').setLevel(logging.ERROR)
+        results = render_pair(changed, cover_letter.model_copy(update={'city': 'Elsewhere'}),
+                              os.path.join(WORKDIR, 'cold-0'))
+        assert results[1].cached is False and os.path.exists(results[1].pdf_path), \
+            "a render should be delivered even when it cannot be cached"
+
+        print(f"{'pass':<6} {'ms/doc':>8}")
+        print(f"{'cold':<6} {cold * 1000:>8.1f}")
+        print(f"{'cached':<6} {warm * 1000:>8.1f}")
+        print(f"cache checks passed, {cache.stats()}")
+    finally:
+        render_pool._render_pool.shutdown()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark render throughput (documents/second) against render pool size
+
+Layout ms is the mean WeasyPrint layout time per document, which the
+pre-parsed shared stylesheet and reused font configuration keep down.
+
+Usage: python benchmarks/bench_render_pool.py [--workers 1 2 4] [--documents 16]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from base_documents import load_base_cv, load_base_cover_letter
+from render_pool import RenderPool
+from rendering import CV_TEMPLATE_PATH, COVER_LETTER_TEMPLATE_PATH, render_template
+
+def sample_documents():
+    """Returns the CV and cover letter HTML from the sample data in the repo"""
+    cv = load_base_cv(os.path.join(ROOT, 'CV.txt'))
+    cover_letter = load_base_cover_letter(os.path.join(ROOT, 'Cover_Letter.txt'))
+    return [
+        render_template(os.path.join(ROOT, CV_TEMPLATE_PATH), cv),
+        render_template(os.path.join(ROOT, COVER_LETTER_TEMPLATE_PATH), cover_letter)
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    default_workers = sorted({1, 2, os.cpu_count() or 1})
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers,
+                        help="Pool sizes to measure; 0 renders inline")
+    parser.add_argument("--documents", type=int, default=16, help="Documents rendered per pool size")
+    args = parser.parse_args(argv)
+
+    documents = sample_documents()
+    output_dir = tempfile.mkdtemp()
+    print(f"{'workers':>7} {'warm-up s':>10} {'seconds':>8} {'docs/s':>8} {'layout ms':>10}")
+    try:
+        for workers in args.workers:
+            start = time.perf_counter()
+            pool = RenderPool(workers)
+            # Wait for every worker to finish its warm-up before timing
+            warm = [pool.submit(documents[0], os.path.join(output_dir, f"warm-{i}.pdf"),
+                                os.path.join(output_dir, f"warm-{i}.jpg")) for i in range(max(workers, 1))]
+            for future in warm:
+                future.result()
+            warm_up = time.perf_counter() - start
+
+            start = time.perf_counter()
+            futures = [
+                pool.submit(documents[i % len(documents)],
+                            os.path.join(output_dir, f"doc-{i}.pdf"),
+                            os.path.join(output_dir, f"doc-{i}.jpg"))
+                for i in range(args.documents)
+            ]
+            layout = sum(future.result().layout_seconds for future in futures) / len(futures)
+            seconds = time.perf_counter() - start
+            pool.shutdown()
+            print(f"{workers:>7} {warm_up:>10.2f} {seconds:>8.2f} {args.documents / seconds:>8.2f} "
+                  f"{layout * 1000:>10.1f}")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark resuming a failed application from its checkpoints vs running it again
+
+Usage: python benchmarks/bench_resume.py [--layout medium] [--latency 0.2]
+
+Runs the crew offline against the local job board and the stub LLM of
+bench_suite.py, with the cover letter writer failing on the first run. It
+checks that the finished tasks were checkpointed, that resuming only calls
+the LLM for the failed task, that a fully checkpointed run makes no LLM
+calls, and that runs without resume or for another posting start over.
+"""
+import argparse
+import collections
+import contextlib
+import io
+import os
+import re
+import time
+
+from offline import ROOT, WORKDIR, cleanup, use_stub_llm
+from job_board import LAYOUTS, JobBoard
+
+AGENT = re.compile(r"You are (Job Description Crawler|CV Writer|Cover Letter Writer)\.")
+
+# Stub calls per agent, reset before each run
+CALLS = collections.Counter()
+# Agents whose next call fails
+FAILING = set()
+
+def run(crew, url: str, output_dir: str, resume: bool):
+    """Runs the crew quietly, returning seconds taken and whether it succeeded"""
+    CALLS.clear()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            crew.run(url, output_dir, verbose=False, resume=resume)
+        succeeded = True
+    except Exception:
+        succeeded = False
+    return time.perf_counter() - start, succeeded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layout", choices=LAYOUTS, default='medium')
+    parser.add_argument("--latency", type=float, default=0.2, help="Fixed seconds per stub LLM call")
+    args = parser.parse_args(argv)
+
+    from job_application_agents import JobApplicationCrew
+    from stub_llm import StubChatModel
+
+    class FlakyStub(StubChatModel):
+        """Stub that counts calls per agent and fails an agent's call on request"""
+
+        def answer(self, prompt: str) -> str:
+            match = AGENT.search(prompt)
+            agent = match.group(1) if match else 'other'
+            CALLS[agent] += 1
+            if agent in FAILING:
+                FAILING.discard(agent)
+                raise RuntimeError(f"{agent} is unavailable")
+            return super().answer(prompt)
+
+    # Templates and base documents are read relative to the repo
+    os.chdir(ROOT)
+    # No LLM cache, so every task that runs again calls the stub again
+    use_stub_llm(FlakyStub, latency=args.latency)
+    output_dir = os.path.join(WORKDIR, 'application')
+    checkpoints = os.path.join(output_dir, 'checkpoints')
+    try:
+        with JobBoard() as board:
+            crew = JobApplicationCrew()
+            url = board.url(args.layout)
+
+            FAILING.add('Cover Letter Writer')
+            failed, succeeded = run(crew, url, output_dir, resume=False)
+            assert not succeeded, "the first run should fail in the cover letter writer"
+            saved = sorted(name for name in os.listdir(checkpoints) if not name.startswith('.'))
+            assert saved == ['create_cv.json', 'extract_job.json', 'job.json'], saved
+
+            resumed, succeeded = run(crew, url, output_dir, resume=True)
+            assert succeeded, "the resumed run should finish"
+            assert set(CALLS) == {'Cover Letter Writer'}, f"only the failed task should run again: {dict(CALLS)}"
+
+            restored, succeeded = run(crew, url, output_dir, resume=True)
+            assert succeeded and not CALLS, f"a finished run should resume without LLM calls: {dict(CALLS)}"
+
+            full, succeeded = run(crew, url, output_dir, resume=False)
+            assert succeeded and {'Job Description Crawler', 'CV Writer', 'Cover Letter Writer'} <= set(CALLS), \
+                "without resume every task should run"
+
+            _, succeeded = run(crew, board.url(args.layout, 1), output_dir, resume=True)
+            assert succeeded and {'Job Description Crawler', 'CV Writer', 'Cover Letter Writer'} <= set(CALLS), \
+                "checkpoints of another posting should not be reused"
+
+        print(f"{'run':<22} {'seconds':>8}")
+        for name, seconds in (('failed', failed), ('resumed', resumed), ('fully checkpointed', restored),
+                              ('full run', full)):
+            print(f"{name:<22} {seconds:>8.2f}")
+        print("checkpoint checks passed")
+    finally:
+        cleanup()
+
+if __name__ == "__main__":
+    main()
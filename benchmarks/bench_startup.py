@@ -0,0 +1,58 @@
+"""
+Report import cost of the CLI, tools and models using ``python -X importtime``
+
+Usage: python benchmarks/bench_startup.py [--top 10] [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'models': 'import models',
+    'tools': 'import extraction, fetching, rendering',
+    'cli': 'import job_application_agents, batch',
+}
+
+# Modules that should only load once the code path that needs them runs
+HEAVY_MODULES = ('crewai', 'langchain', 'langchain_openai', 'openai', 'weasyprint',
+                 'pdf2image', 'PIL', 'bs4', 'requests', 'pybars', 'dotenv')
+
+def import_profile(statement: str):
+    """Returns {module: (self_us, cumulative_us, depth)} for one interpreter start"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        profile[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return profile
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list per target")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target; the fastest is reported")
+    args = parser.parse_args(argv)
+
+    for target, statement in TARGETS.items():
+        runs = [import_profile(statement) for _ in range(args.repeat)]
+        total_us = min(sum(entry[0] for entry in run.values()) for run in runs)
+        profile = runs[-1]
+        heavy = sorted({name.split('.')[0] for name in profile} & set(HEAVY_MODULES))
+        print(f"{target}: {statement}")
+        print(f"  total import time {total_us / 1000:.1f} ms, {len(profile)} modules")
+        print(f"  heavy modules loaded: {', '.join(heavy) or 'none'}")
+        top_level = [(name, cumulative) for name, (_, cumulative, depth) in profile.items()
+                     if depth == 0]
+        for name, cumulative in sorted(top_level, key=lambda item: -item[1])[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Offline benchmark suite for the whole pipeline and its hot spots
+
+Usage: python benchmarks/bench_suite.py [--output benchmarks/results.json]
+                                        [--baseline benchmarks/baseline.json] [--save-baseline]
+                                        [--tolerance 0.25] [--quick]
+
+The full JobApplicationCrew runs against a deterministic stub LLM and a
+local job board serving pages of three sizes, once with cold caches and
+once with warm ones, and a small batch measures throughput. Micro-benchmarks
+cover get_webpage_contents, render_template, PDF/JPEG conversion and model
+validation. Results are written as JSON and, when a baseline exists,
+compared against it; the exit status is 1 if any metric regressed by more
+than the tolerance.
+
+Every cache lives in a temporary directory, so runs do not touch .cache and
+start from the same state. No network access or API key is needed.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from offline import ROOT, WORKDIR, cleanup, use_stub_llm
+from job_board import LAYOUTS, JobBoard
+from base_documents import load_base_cv, load_base_cover_letter
+from models import CV, CoverLetter
+from rendering import CV_TEMPLATE_PATH, COVER_LETTER_TEMPLATE_PATH, render_document, render_template
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'results.json')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# Changes smaller than these are noise whatever the tolerance says
+NOISE_FLOOR = {'us': 2.0, 'ms': 0.5, 's': 0.05, 'MB': 2.0, 'jobs/min': 0.5, 'tokens': 0, 'count': 0}
+
+def metric(metrics: dict, name: str, value: float, unit: str, better: str = 'lower'):
+    metrics[name] = {'value': round(value, 3), 'unit': unit, 'better': better}
+
+def median_seconds(func, repeat: int, number: int = 1) -> float:
+    """Median wall time of one call, over repeat samples of number calls each"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+def peak_megabytes(func) -> float:
+    """Peak Python heap allocated by one call"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+def peak_rss_megabytes() -> float:
+    """Peak resident memory of this process, not counting render workers"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+@contextlib.contextmanager
+def quiet():
+    """Swallows the agents' console output while the pipeline runs"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def micro_benchmarks(board: JobBoard, repeat: int, render_repeat: int) -> dict:
+    from job_application_agents import get_webpage_contents
+
+    metrics = {}
+    # Loads the parser and extraction rules, so cold timings are only the fetch
+    get_webpage_contents(board.url(LAYOUTS[0], 10 ** 6))
+    for layout in LAYOUTS:
+        url = board.url(layout)
+        start = time.perf_counter()
+        contents = get_webpage_contents(url)
+        metric(metrics, f"webpage.{layout}.cold_ms", (time.perf_counter() - start) * 1000, 'ms')
+        assert not contents.startswith('Error'), contents
+        # Later calls are served by the HTTP cache: extraction and condensing
+        metric(metrics, f"webpage.{layout}.ms", median_seconds(lambda: get_webpage_contents(url), repeat) * 1000, 'ms')
+        metric(metrics, f"webpage.{layout}.peak_mb", peak_megabytes(lambda: get_webpage_contents(url)), 'MB')
+
+    cv_data = load_base_cv().model_dump(mode='json')
+    cover_letter_data = load_base_cover_letter().model_dump(mode='json')
+    cover_letter_data.update(job_title='Senior Front End Developer', company_name='Example Corp',
+                             company_state='TX', company_zip='78701')
+    documents = {
+        'cv': (CV, cv_data, CV_TEMPLATE_PATH),
+        'cover_letter': (CoverLetter, cover_letter_data, COVER_LETTER_TEMPLATE_PATH),
+    }
+    output_dir = os.path.join(WORKDIR, 'micro')
+    os.makedirs(output_dir, exist_ok=True)
+    for document, (model_cls, data, template_path) in documents.items():
+        encoded = json.dumps(data)
+        metric(metrics, f"validate.{document}.us",
+               median_seconds(lambda: model_cls(**data), repeat, number=200) * 1e6, 'us')
+        metric(metrics, f"validate.{document}_json.us",
+               median_seconds(lambda: model_cls.model_validate_json(encoded), repeat, number=200) * 1e6, 'us')
+
+        model = model_cls(**data)
+        metric(metrics, f"render_template.{document}.ms",
+               median_seconds(lambda: render_template(template_path, model), repeat, number=20) * 1000, 'ms')
+
+        # Conversion runs in-process here, without the pool or render cache
+        html_content = render_template(template_path, model)
+        pdf_path = os.path.join(output_dir, f"{document}.pdf")
+        jpg_path = os.path.join(output_dir, f"{document}.jpg")
+        render_document(html_content, pdf_path, jpg_path)
+        results = [render_document(html_content, pdf_path, jpg_path) for _ in range(render_repeat)]
+        for step in results[0].steps:
+            metric(metrics, f"convert.{document}.{step}_ms",
+                   statistics.median(result.steps[step][0] for result in results) * 1000, 'ms')
+        metric(metrics, f"convert.{document}.peak_mb",
+               peak_megabytes(lambda: render_document(html_content, pdf_path, jpg_path)), 'MB')
+    return metrics
+
+def pipeline_benchmarks(board: JobBoard, latency: float, seconds_per_token: float,
+                        jobs: int, workers: int) -> dict:
+    from batch import run_batch
+    from job_application_agents import JobApplicationCrew
+
+    stub = use_stub_llm(cached=True, latency=latency, seconds_per_token=seconds_per_token)
+
+    metrics = {}
+    crew = JobApplicationCrew()
+    for layout in LAYOUTS:
+        output_dir = os.path.join(WORKDIR, 'pipeline', layout)
+        for state in ('cold', 'warm'):
+            calls = stub.calls
+            start = time.perf_counter()
+            with quiet():
+                result = json.loads(crew.run(board.url(layout), output_dir, verbose=False))
+            metric(metrics, f"pipeline.{layout}.{state}_s", time.perf_counter() - start, 's')
+            metric(metrics, f"pipeline.{layout}.{state}_first_artifact_s", crew.first_artifact_seconds, 's')
+            if state == 'cold':
+                metric(metrics, f"pipeline.{layout}.llm_calls", stub.calls - calls, 'count')
+                metric(metrics, f"pipeline.{layout}.prompt_tokens", crew.token_usage['prompt_tokens'], 'tokens')
+            else:
+                assert stub.calls == calls, "a warm run should be served from the LLM cache"
+            assert result['success'], result
+
+    # Distinct postings, so the batch cannot reuse the runs above
+    urls = [board.url(LAYOUTS[i % len(LAYOUTS)], i + 1) for i in range(jobs)]
+    start = time.perf_counter()
+    with quiet():
+        results = run_batch(urls, os.path.join(WORKDIR, 'batch'), max_workers=workers)
+    wall = time.perf_counter() - start
+    metric(metrics, "batch.jobs_per_min", len(urls) / wall * 60, 'jobs/min', better='higher')
+    metric(metrics, "batch.failed", sum(not r.success for r in results), 'count')
+    metric(metrics, "pipeline.peak_rss_mb", peak_rss_megabytes(), 'MB')
+    return metrics
+
+def environment() -> dict:
+    try:
+        import weasyprint
+        weasyprint_version = getattr(weasyprint, '__version__', 'unknown')
+    except ImportError:
+        weasyprint_version = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'weasyprint': weasyprint_version,
+        'commit': commit,
+    }
+
+def compare(metrics: dict, baseline: dict, tolerance: float) -> list:
+    """Returns (name, baseline, current, change, status) for every current metric"""
+    rows = []
+    for name, current in metrics.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, current['value'], None, 'new'))
+            continue
+        old, new = before['value'], current['value']
+        change = (new - old) / old if old else 0.0
+        worse = change > tolerance if current['better'] == 'lower' else change < -tolerance
+        better = change < -tolerance if current['better'] == 'lower' else change > tolerance
+        if abs(new - old) <= NOISE_FLOOR.get(current['unit'], 0):
+            status = 'ok'
+        else:
+            status = 'REGRESSED' if worse else 'improved' if better else 'ok'
+        rows.append((name, old, new, change, status))
+    return rows
+
+def format_comparison(rows: list) -> str:
+    lines = [f"{'metric':<40} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for name, old, new, change, status in rows:
+        old_text = '-' if old is None else f"{old:.3f}"
+        change_text = '-' if change is None else f"{change:+.0%}"
+        lines.append(f"{name:<40} {old_text:>10} {new:>10.3f} {change_text:>8}  {status}")
+    return "\n".join(lines)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative change beyond which a metric counts as regressed")
+    parser.add_argument("--repeat", type=int, default=7, help="Samples per micro-benchmark")
+    parser.add_argument("--render-repeat", type=int, default=3, help="Samples per PDF/JPEG conversion")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per stub LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.0005,
+                        help="Seconds per generated token of the stub LLM")
+    parser.add_argument("--jobs", type=int, default=6, help="Postings in the throughput batch")
+    parser.add_argument("--workers", type=int, default=3, help="Concurrent crews in the batch")
+    parser.add_argument("--quick", action="store_true", help="Fewer samples and a smaller batch")
+    parser.add_argument("--skip-pipeline", action="store_true", help="Run the micro-benchmarks only")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repeat, args.render_repeat, args.jobs = 3, 1, 3
+    # Base documents and templates are found relative to the repository
+    os.chdir(ROOT)
+
+    metrics = {}
+    try:
+        with JobBoard() as board:
+            metrics.update(micro_benchmarks(board, args.repeat, args.render_repeat))
+            if not args.skip_pipeline:
+                metrics.update(pipeline_benchmarks(board, args.latency, args.token_latency,
+                                                   args.jobs, args.workers))
+    finally:
+        cleanup()
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {key: value for key, value in vars(args).items()
+                     if key not in ('output', 'baseline', 'save_baseline')},
+        'metrics': metrics,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"results written to {args.output}")
+
+    baseline = {}
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            recorded = json.load(file)
+        if recorded.get('settings') != results['settings']:
+            print("warning: the baseline was recorded with different settings")
+        baseline = recorded['metrics']
+    rows = compare(metrics, baseline, args.tolerance)
+    print(format_comparison(rows))
+    return 1 if any(row[4] == 'REGRESSED' for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Local job board serving deterministic job posting pages for offline benchmarks
+
+Pages are served at ``/jobs/<layout>/<n>.html``. Each layout mirrors a kind
+of page seen in the wild, at a different size:
+
+- ``small``: an ATS page carrying a schema.org JobPosting in JSON-LD
+- ``medium``: a careers page matched by the generic selectors, with a large
+  navigation, scripts, benefits and legal boilerplate around the posting
+- ``large``: a job board page without usable markup, deeply nested and full
+  of related postings, which needs the largest-text-block fallback
+
+The same layout and number always produce the same page, and different
+numbers produce different companies and requirements, so postings do not
+share LLM cache entries.
+"""
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LAYOUTS = ('small', 'medium', 'large')
+
+SKILLS = ("React", "TypeScript", "JavaScript", "Node.js", "GraphQL", "REST APIs", "CSS", "HTML",
+          "Python", "AWS", "Docker", "Kubernetes", "CI/CD", "Jest", "Cypress", "Webpack",
+          "accessibility", "design systems", "performance tuning", "Adobe Experience Manager")
+DUTIES = ("Build and maintain customer facing web applications using {skill}",
+          "Work with product and design to ship features built on {skill}",
+          "Review code and mentor engineers on {skill} best practices",
+          "Improve the reliability and performance of services that rely on {skill}",
+          "Own the roadmap for our {skill} platform")
+REQUIREMENTS = ("{years}+ years of professional experience with {skill}",
+                "Strong understanding of {skill}",
+                "Experience shipping production systems with {skill}",
+                "Familiarity with {skill} is a plus")
+COMPANIES = ("Acme Analytics", "Northwind Labs", "Globex Software", "Initech Cloud", "Umbrella Health",
+             "Stark Logistics", "Wayne Fintech", "Soylent Foods", "Hooli Media", "Vandelay Imports")
+TITLES = ("Senior Front End Developer", "Full Stack Engineer", "Staff Web Engineer",
+          "Frontend Platform Engineer", "Lead UI Developer")
+CITIES = ("Austin, TX", "San Francisco, CA", "New York, NY", "Remote", "Seattle, WA")
+
+BOILERPLATE = (
+    "We are an equal opportunity employer and value diversity at our company. We do not discriminate "
+    "on the basis of race, religion, color, national origin, gender, sexual orientation, age, marital "
+    "status, veteran status, or disability status.",
+    "Benefits include competitive salary, health, dental and vision insurance, 401(k) matching, "
+    "unlimited paid time off, a home office stipend and a yearly learning budget.",
+    "By applying you agree to our privacy policy and the processing of your personal data.",
+    "Apply now! Share this job with your friends on social media.",
+)
+
+def posting(layout: str, number: int) -> dict:
+    """The job a page describes, as plain data"""
+    rng = random.Random(f"{layout}-{number}")
+    skills = rng.sample(SKILLS, 8)
+    return {
+        'title': rng.choice(TITLES),
+        'company': f"{rng.choice(COMPANIES)} {number}",
+        'location': rng.choice(CITIES),
+        'about': f"We build software that helps teams move faster. Posting {layout}-{number}.",
+        'duties': [rng.choice(DUTIES).format(skill=skill) for skill in skills[:5]],
+        'requirements': [rng.choice(REQUIREMENTS).format(skill=skill, years=rng.randint(2, 8))
+                         for skill in skills[3:]],
+    }
+
+def description_html(job: dict) -> str:
+    duties = ''.join(f"<li>{html.escape(duty)}</li>" for duty in job['duties'])
+    requirements = ''.join(f"<li>{html.escape(item)}</li>" for item in job['requirements'])
+    boilerplate = ''.join(f"<p>{html.escape(text)}</p>" for text in BOILERPLATE)
+    return (f"<h3>About us</h3><p>{html.escape(job['about'])}</p>"
+            f"<h3>Responsibilities</h3><ul>{duties}</ul>"
+            f"<h3>Requirements</h3><ul>{requirements}</ul>"
+            f"<h3>Benefits</h3>{boilerplate}")
+
+def navigation(rng: random.Random, links: int) -> str:
+    items = ''.join(f"<li><a href='/section/{i}'>Section {rng.randint(0, 999)}</a></li>" for i in range(links))
+    return f"<nav><ul>{items}</ul></nav>"
+
+def related_postings(rng: random.Random, count: int) -> str:
+    cards = []
+    for i in range(count):
+        job = posting('related', rng.randint(0, 10 ** 6))
+        cards.append(f"<div class='card'><div><a href='/jobs/related/{i}.html'>{html.escape(job['title'])}</a>"
+                     f"</div><div>{html.escape(job['company'])}</div><div>{html.escape(job['location'])}</div></div>")
+    return ''.join(cards)
+
+def small_page(job: dict, rng: random.Random) -> str:
+    data = {
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": job['title'],
+        "hiringOrganization": {"@type": "Organization", "name": job['company']},
+        "jobLocation": {"@type": "Place", "address": {"@type": "PostalAddress", "addressLocality": job['location']}},
+        "description": description_html(job),
+    }
+    return (f"<html><head><title>{html.escape(job['title'])}</title>"
+            f"<script type='application/ld+json'>{json.dumps(data)}</script></head>"
+            f"<body>{navigation(rng, 20)}<h1>{html.escape(job['title'])}</h1>"
+            f"<div>{description_html(job)}</div></body></html>")
+
+def medium_page(job: dict, rng: random.Random) -> str:
+    script = "<script>window.analytics = " + json.dumps({'events': list(range(2000))}) + ";</script>"
+    return (f"<html><head><title>Careers</title>{script}</head><body>{navigation(rng, 300)}"
+            f"<main><h1 class='job-title'>{html.escape(job['title'])}</h1>"
+            f"<div class='company-name'>{html.escape(job['company'])}</div>"
+            f"<div class='location'>{html.escape(job['location'])}</div>"
+            f"<div class='job-description'>{description_html(job)}</div></main>"
+            f"<aside>{related_postings(rng, 60)}</aside>"
+            f"<footer>{''.join(f'<p>{text}</p>' for text in BOILERPLATE * 10)}</footer></body></html>")
+
+def large_page(job: dict, rng: random.Random) -> str:
+    content = (f"<div><div><span>{html.escape(job['title'])}</span> at "
+               f"<span>{html.escape(job['company'])}</span></div>"
+               f"<div>{description_html(job)}</div></div>")
+    for level in range(40):
+        content = f"<div class='wrap-{level}'>{content}</div>"
+    sidebar = ''.join(f"<div class='rail-{i}'>{related_postings(rng, 40)}</div>" for i in range(30))
+    return (f"<html><head><title>Jobs</title></head><body>{navigation(rng, 800)}"
+            f"<div class='page'>{content}<div class='rail'>{sidebar}</div></div></body></html>")
+
+PAGES = {'small': small_page, 'medium': medium_page, 'large': large_page}
+
+def job_page(layout: str, number: int = 0) -> str:
+    """Returns the HTML of one posting page"""
+    return PAGES[layout](posting(layout, number), random.Random(f"page-{layout}-{number}"))
+
+class JobBoard:
+    """Serves job pages from a background thread on a free local port
+
+    latency delays every response, standing in for a remote site.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._pages = {}
+        self._lock = threading.Lock()
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = board.page(self.path)
+                if page is None:
+                    self.send_error(404)
+                    return
+                time.sleep(board.latency)
+                body = page.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='job-board', daemon=True)
+
+    def page(self, path: str):
+        parts = path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'jobs' or parts[1] not in PAGES or not parts[2].endswith('.html'):
+            return None
+        try:
+            number = int(parts[2][:-len('.html')])
+        except ValueError:
+            return None
+        with self._lock:
+            self.requests += 1
+            key = (parts[1], number)
+            if key not in self._pages:
+                self._pages[key] = job_page(*key)
+            return self._pages[key]
+
+    def url(self, layout: str, number: int = 0) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/jobs/{layout}/{number}.html"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,50 @@
+"""
+Shared set-up for benchmarks that run the pipeline offline
+
+Importing this module points every cache at a temporary working directory
+and disables crewai's telemetry, so import it before any pipeline module
+reads its defaults. Spawned render workers import the benchmark script
+again; they inherit the directory through the environment instead of
+creating their own.
+
+For the same reason scripts import the pipeline inside their functions, or
+through ``use_stub_llm()``, so render workers do not pay for LangChain at
+start-up.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKDIR = os.environ.get('JOB_BENCH_DIR') or tempfile.mkdtemp(prefix='job-bench-')
+os.environ['JOB_BENCH_DIR'] = WORKDIR
+os.environ.setdefault('JOB_FETCH_CACHE_DIR', os.path.join(WORKDIR, 'http'))
+os.environ.setdefault('JOB_LLM_CACHE_PATH', os.path.join(WORKDIR, 'llm.sqlite3'))
+os.environ.setdefault('JOB_RENDER_CACHE_DIR', os.path.join(WORKDIR, 'render'))
+# crewai reports telemetry through OpenTelemetry unless the SDK is disabled
+os.environ.setdefault('OTEL_SDK_DISABLED', 'true')
+
+def use_stub_llm(stub_class=None, cached: bool = False, **fields):
+    """Registers a stub chat model as the pipeline's LLM and returns it
+
+    The stub feeds its token usage into the current trace like the real
+    model. With cached it sits behind the LLM response cache; without, every
+    call reaches the stub. stub_class defaults to stub_llm.StubChatModel.
+    """
+    from job_application_agents import set_llm
+    from llm_cache import get_llm_cache
+    from stub_llm import StubChatModel
+    from tracing import token_callback
+
+    if cached:
+        fields['cache'] = get_llm_cache()
+    stub = (stub_class or StubChatModel)(callbacks=[token_callback()], **fields)
+    set_llm(stub)
+    return stub
+
+def cleanup():
+    """Removes the working directory and every cache in it"""
+    shutil.rmtree(WORKDIR, ignore_errors=True)
@@ -0,0 +1,126 @@
+"""
+Deterministic stand-in for the OpenAI chat model, for offline pipeline runs
+
+The stub recognizes which agent is prompting it and answers the way a
+well-behaved model would: the crawler calls get_webpage_contents and then
+summarizes the page, the CV writer returns the base CV, and the cover letter
+writer returns the base cover letter with its placeholders filled in from
+the job summary. Every answer takes a simulated network and generation time
+and reports estimated token usage, so tracing and token totals behave as
+they do against the API.
+"""
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from base_documents import load_base_cv, load_base_cover_letter
+from condense import count_tokens
+
+URL = re.compile(r"https?://[^\s\"'`]+")
+
+def _first_json_object(text: str) -> Optional[dict]:
+    """Decodes the first JSON object in text, if there is one"""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+class StubChatModel(BaseChatModel):
+    """Chat model answering each agent's prompts deterministically
+
+    latency is the fixed cost of a call, seconds_per_token the cost of each
+    generated token and seconds_per_prompt_token that of each prompt token
+    the model has to read. calls counts the calls that reached the stub,
+    i.e. those not served from the LLM cache.
+    """
+    latency: float = 0.2
+    seconds_per_token: float = 0.0005
+    seconds_per_prompt_token: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        text = self.answer(prompt)
+        usage = {'prompt_tokens': count_tokens(prompt), 'completion_tokens': count_tokens(text)}
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+        self.calls += 1
+        time.sleep(self.latency + self.seconds_per_token * usage['completion_tokens']
+                   + self.seconds_per_prompt_token * usage['prompt_tokens'])
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))],
+                          llm_output={'token_usage': usage, 'model_name': self._llm_type})
+
+    def answer(self, prompt: str) -> str:
+        if "Return a valid schema for the tool" in prompt:
+            return self.tool_call(prompt)
+        if "You are Job Description Crawler." in prompt:
+            return self.crawl(prompt)
+        if "You are CV Writer." in prompt:
+            return self.final_answer(load_base_cv().model_dump_json())
+        if "You are Cover Letter Writer." in prompt:
+            return self.final_answer(self.cover_letter(prompt))
+        # Re-prompts for invalid fields never happen with the answers above
+        return "{}"
+
+    @staticmethod
+    def final_answer(text: str) -> str:
+        return f"Thought: Do I need to use a tool? No\nFinal Answer: {text}"
+
+    @staticmethod
+    def tool_call(prompt: str) -> str:
+        url = URL.search(prompt.split("Tool Arguments:", 1)[-1])
+        return json.dumps({"tool_name": "get_webpage_contents",
+                           "arguments": {"url": url.group(0) if url else ""}})
+
+    def crawl(self, prompt: str) -> str:
+        _, _, observation = prompt.rpartition("Observation:")
+        page = _first_json_object(observation)
+        if not page or 'description' not in page:
+            url = URL.search(prompt.split("Current Task:", 1)[-1])
+            return ("Thought: Do I need to use a tool? Yes\nAction: get_webpage_contents\n"
+                    f"Action Input: {json.dumps({'url': url.group(0).rstrip('.') if url else ''})}")
+        lines = [line.strip() for line in page['description'].splitlines() if len(line.strip()) > 20]
+        return self.final_answer(json.dumps({
+            'title': page.get('title', ''),
+            'company': page.get('company', ''),
+            'location': page.get('location', ''),
+            'requirements': lines[:12]
+        }))
+
+    @staticmethod
+    def cover_letter(prompt: str) -> str:
+        job = _first_json_object(prompt.split("This is the context you're working with:", 1)[-1]) or {}
+        title = (job.get('title') or 'Software Engineer')[:50]
+        company = (job.get('company') or 'the company')[:50]
+        letter = json.loads(load_base_cover_letter().model_dump_json())
+
+        def fill(text: str) -> str:
+            return text.replace('[Position Title]', title).replace('[Company Name]', company)
+
+        letter.update(
+            hiring_manager_name='Hiring Manager', job_title=title, company_name=company,
+            company_address='1 Market Street', company_city='Austin', company_state='TX',
+            company_zip='78701',
+            paragraphs=[fill(paragraph) for paragraph in letter['paragraphs']],
+            closing_paragraph=fill(letter['closing_paragraph'])
+        )
+        return json.dumps(letter)
@@ -0,0 +1,54 @@
+"""
+Per-job checkpoints of crew task outputs, so failed runs can resume
+"""
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+class CheckpointStore:
+    """Saves each task's output to ``<directory>/<task>.json`` as it finishes
+
+    A job.json file records which job URL the checkpoints belong to, and
+    checkpoints for any other URL are discarded. Files are written to a
+    temporary name and renamed, so an interrupted run never leaves a
+    partial checkpoint behind.
+    """
+
+    def __init__(self, directory: str, job_url: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if self._read('job') != {'url': job_url}:
+            self.clear()
+            self._write('job', {'url': job_url})
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _read(self, name: str) -> Optional[dict]:
+        try:
+            with open(self._path(name), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, name: str, data: dict):
+        fd, staging = tempfile.mkstemp(dir=self.directory, prefix='.staging-')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file)
+        os.replace(staging, self._path(name))
+
+    def save(self, task_name: str, result: str):
+        self._write(task_name, {'result': result, 'finished': time.time()})
+
+    def load(self, task_name: str) -> Optional[str]:
+        """Returns a task's saved output, or None when it has not finished yet"""
+        checkpoint = self._read(task_name)
+        return checkpoint['result'] if checkpoint else None
+
+    def clear(self):
+        """Drops every task checkpoint, keeping the job record"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') and name != 'job.json':
+                os.remove(os.path.join(self.directory, name))
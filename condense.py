@@ -0,0 +1,154 @@
+"""
+Condensing scraped job descriptions before they are sent to the LLM
+"""
+import functools
+import os
+import re
+from typing import List, Optional, Tuple
+
+TOKEN_BUDGET = int(os.getenv('JOB_DESCRIPTION_TOKEN_BUDGET', '1500'))
+TOKEN_ENCODING = 'cl100k_base'
+
+# Navigation, sharing and legal lines that job boards wrap around a posting.
+# The whole line has to match, so bullets such as "Apply machine learning to
+# ranking" or "Share knowledge with the team" survive
+BOILERPLATE = re.compile(
+    r"(apply( now| for this (job|position))?|share( this (job|posting))?|save( this)? job|"
+    r"sign (in|up)|log ?in|back to (all )?(jobs|search|results)|view all (jobs|openings)|"
+    r"similar jobs|report this job|skip to (main )?content|powered by( [\w.-]+){1,2}|"
+    r"follow us( on [\w.-]+)?|(accept|reject|manage)( all)? cookies|cookie (policy|settings)|"
+    r"privacy (policy|notice)|terms (of (use|service)|and conditions)|all rights reserved)"
+    r"[\s.!:|>›»-]*|"
+    # Copyright notices name the year and company, so only their start is fixed
+    r"(©|(copyright|\(c\))( ©)? \d{4}).{0,80}|we use cookies\b.{0,120}",
+    re.IGNORECASE
+)
+
+# A whole line that names a section, such as "Requirements" or "About the role"
+HEADING = re.compile(
+    r"((key|core|main|basic|minimum|preferred|required|desired|additional|technical|"
+    r"your|the|our|job|role) )*"
+    r"(requirements?|qualifications?|responsibilities|skills|experience|duties|benefits|perks|"
+    r"compensation|salary|nice to haves?|must haves?|who you are|your role|the role|"
+    r"what you(['’]ll| will) (do|bring)|(what|who) we(['’]re| are) looking for|what we offer|"
+    r"how to apply|about (us|you|the (role|team|company|job|position))|"
+    r"equal (employment )?opportunity( employer)?)"
+    r"( (and|&) (requirements|qualifications|responsibilities|skills|experience|benefits|perks))?",
+    re.IGNORECASE
+)
+# Phrases that mark a longer Title Case line as a heading, as in "What You'll
+# Bring to the Team". Single words such as "Skills" or "Experience" also start
+# or end bullets ("Experience with Python"), so they only count in a HEADING
+HEADING_PHRASES = re.compile(
+    r"what you(['’]ll| will) (do|bring|get)|(what|who) we(['’]re| are) looking for|who you are|"
+    r"nice to haves?|must haves?|about (us|you|the)|what we offer|how to apply|"
+    r"equal (employment )?opportunity",
+    re.IGNORECASE
+)
+MAX_HEADING_LENGTH = 60
+# Words that stay lowercase in Title Case
+MINOR_WORDS = frozenset(('a', 'an', 'and', 'as', 'at', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'))
+
+# Sections the writers need most; they are kept first when over budget
+PRIORITY = re.compile(
+    r"requirement|qualification|responsibilit|what you('ll| will) (do|bring)|looking for|"
+    r"skills|experience|who you are|your role|duties|nice to have|preferred|must have",
+    re.IGNORECASE
+)
+
+@functools.lru_cache(maxsize=None)
+def _encoding():
+    """The tokenizer of the OpenAI chat models, or None when it is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        return None
+
+def count_tokens(text: str) -> int:
+    """Counts tokens like the chat model does, estimating four characters per token without tiktoken"""
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+def clean_lines(text: str) -> List[str]:
+    """Normalizes whitespace and drops empty, boilerplate and duplicate lines"""
+    lines = []
+    seen = set()
+    for raw in text.splitlines():
+        line = ' '.join(raw.split())
+        if not any(char.isalnum() for char in line):
+            continue
+        if BOILERPLATE.fullmatch(line):
+            continue
+        key = line.casefold()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+def _is_title_case(line: str) -> bool:
+    words = [word for word in line.split() if any(char.isalpha() for char in word)]
+    return bool(words) and words[0][0].isupper() and all(
+        word[0].isupper() or word.casefold() in MINOR_WORDS for word in words
+    )
+
+def _is_heading(line: str) -> bool:
+    """Whether a line is written as a heading: "Skills:", "Requirements" or "What You'll Do"
+
+    Bullets such as "Strong Communication Skills" or "Python Experience
+    Required" mention the same words, even in Title Case, so a heading word
+    alone is not enough.
+    """
+    if len(line) > MAX_HEADING_LENGTH or line.endswith(('.', ',', ';')):
+        return False
+    if line.endswith(':'):
+        return True
+    return bool(HEADING.fullmatch(line)) or (_is_title_case(line) and bool(HEADING_PHRASES.search(line)))
+
+def split_sections(lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+    """Groups lines under the heading before them; the intro has no heading"""
+    sections = [(None, [])]
+    for line in lines:
+        if _is_heading(line):
+            sections.append((line, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+def condense_description(text: str, token_budget: int = TOKEN_BUDGET) -> str:
+    """Shrinks a job description to what the writers need, within a token budget
+
+    Whitespace is normalized and boilerplate and repeated lines are removed.
+    If the rest is still over budget, requirement and responsibility
+    sections are kept first, then the remaining sections in page order,
+    line by line until the budget is spent. The kept lines stay in their
+    original order.
+    """
+    lines = clean_lines(text)
+    costs = [count_tokens(line) + 1 for line in lines]
+    if sum(costs) <= token_budget:
+        return '\n'.join(lines)
+
+    sections = split_sections(lines)
+    order = sorted(range(len(sections)),
+                   key=lambda i: (not (sections[i][0] and PRIORITY.search(sections[i][0])), i))
+    cost = dict(zip(lines, costs))
+    keep = set()
+    remaining = token_budget
+    for i in order:
+        heading, section = sections[i]
+        taken = []
+        for line in section:
+            if cost[line] > remaining:
+                break
+            taken.append(line)
+            remaining -= cost[line]
+        if heading and taken == [heading] and len(section) > 1:
+            # A heading without any of its content is only noise
+            remaining += cost[heading]
+            taken = []
+        keep.update(taken)
+    return '\n'.join(line for line in lines if line in keep)
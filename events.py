@@ -0,0 +1,96 @@
+"""
+Structured progress events streamed from a running pipeline
+"""
+import contextlib
+import contextvars
+import functools
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+# Stage events, in the order a run usually produces them
+JOB_EXTRACTED = 'job_extracted'
+CV_READY = 'cv_ready'
+COVER_LETTER_READY = 'cover_letter_ready'
+DOCUMENTS_PROCESSED = 'documents_processed'
+ARTIFACT_WRITTEN = 'artifact_written'
+TOKEN = 'token'
+DONE = 'done'
+ERROR = 'error'
+
+@dataclass
+class Event:
+    """One thing that happened in a run, ``elapsed`` seconds after it started"""
+    kind: str
+    elapsed: float
+    data: dict = field(default_factory=dict)
+
+class EventStream:
+    """Queues the events of one run for a consumer iterating in another thread
+
+    Events can be emitted from any thread, including render pool callbacks
+    that do not share the run's context. Iteration ends once ``close()`` is
+    called.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self._queue = queue.Queue()
+
+    def emit(self, kind: str, **data) -> Event:
+        event = Event(kind, time.perf_counter() - self.origin, data)
+        self._queue.put(event)
+        return event
+
+    def close(self):
+        self._queue.put(None)
+
+    def __iter__(self) -> Iterator[Event]:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            yield event
+
+_stream = contextvars.ContextVar('event_stream', default=None)
+_task = contextvars.ContextVar('event_task', default=None)
+
+@contextlib.contextmanager
+def streaming(stream: EventStream):
+    """Sends the events emitted in this context to stream"""
+    token = _stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _stream.reset(token)
+
+def current_stream() -> Optional[EventStream]:
+    return _stream.get()
+
+def emit(kind: str, **data):
+    """Emits an event to the current stream; a no-op outside ``streaming()``"""
+    stream = _stream.get()
+    if stream is not None:
+        stream.emit(kind, **data)
+
+@contextlib.contextmanager
+def task_scope(name: str):
+    """Labels the tokens streamed in this context with the task producing them"""
+    token = _task.set(name)
+    try:
+        yield
+    finally:
+        _task.reset(token)
+
+@functools.lru_cache(maxsize=None)
+def token_stream_callback() -> "BaseCallbackHandler":
+    """A LangChain callback that emits each streamed LLM token to the current stream"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TokenStreamHandler(BaseCallbackHandler):
+        def on_llm_new_token(self, token, **kwargs):
+            if token:
+                emit(TOKEN, task=_task.get(), text=token)
+
+    return TokenStreamHandler()
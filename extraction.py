@@ -0,0 +1,230 @@
+"""
+Job posting extraction from raw HTML
+"""
+import html
+import importlib.util
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# bs4 and soupsieve are imported where they are used so importing this module
+# stays cheap; lxml is preferred when it is installed
+PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+CONTENT_BLOCK_TAGS = ('div', 'section', 'article')
+FIELDS = ('title', 'company', 'location', 'description')
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_rules.json')
+
+def make_soup(markup: str) -> "BeautifulSoup":
+    """Parses HTML with lxml when it is installed, falling back to html.parser"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, PARSER)
+
+def _string_summary(text: str):
+    """Returns (length, leading whitespace, trailing whitespace) for a text run"""
+    length = len(text)
+    return length, length - len(text.lstrip()), length - len(text.rstrip())
+
+def _combine(left, right):
+    """Summarizes the concatenation of two text runs from their summaries"""
+    n1, lead1, trail1 = left
+    n2, lead2, trail2 = right
+    lead = lead1 if lead1 < n1 else n1 + lead2
+    trail = trail2 if trail2 < n2 else n2 + trail1
+    return n1 + n2, lead, trail
+
+def largest_text_block(soup: "BeautifulSoup", tags=CONTENT_BLOCK_TAGS):
+    """Returns the content block with the most stripped text in a single pass
+
+    Equivalent to ``max(soup.find_all(tags), key=lambda x: len(x.text.strip()))``
+    but linear in the size of the document: every tag's text length is built
+    bottom-up from its children instead of re-walking each subtree.
+    """
+    from bs4 import CData, NavigableString, Tag
+
+    # Tag.text keeps only strings of exactly these types, so comments,
+    # doctypes, processing instructions and script or stylesheet contents
+    # never count, while CDATA sections (kept by html.parser) do
+    text_types = (NavigableString, CData)
+    ordered = soup.find_all(True)
+    summaries = {}
+    empty = (0, 0, 0)
+    for tag in reversed(ordered):
+        summary = empty
+        for child in tag.contents:
+            if isinstance(child, Tag):
+                part = summaries[id(child)]
+            elif type(child) in text_types:
+                part = _string_summary(child)
+            else:
+                continue
+            summary = _combine(summary, part)
+        summaries[id(tag)] = summary
+
+    best = None
+    best_length = -1
+    for tag in ordered:
+        if tag.name not in tags:
+            continue
+        length, lead, trail = summaries[id(tag)]
+        stripped = length - lead - trail if lead < length else 0
+        if stripped > best_length:
+            best, best_length = tag, stripped
+    return best
+
+@dataclass
+class SiteRule:
+    """Precompiled selectors for one job board, in priority order per field"""
+    name: str
+    hosts: List[str]
+    selectors: Dict[str, list] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, name: str, hosts: List[str], fields: dict) -> "SiteRule":
+        import soupsieve
+
+        return cls(
+            name=name,
+            hosts=hosts,
+            selectors={
+                key: [soupsieve.compile(selector) for selector in fields.get(key, [])]
+                for key in FIELDS
+            }
+        )
+
+    def select_text(self, soup: "BeautifulSoup", key: str, separator: str = '') -> str:
+        for selector in self.selectors.get(key, []):
+            element = selector.select_one(soup)
+            if element:
+                text = element.get_text(separator).strip()
+                if text:
+                    return text
+        return ''
+
+class ExtractorRegistry:
+    """Site-specific extraction rules keyed by hostname, with a generic fallback"""
+
+    def __init__(self, generic: SiteRule, sites: List[SiteRule]):
+        self.generic = generic
+        self.sites = sites
+        self._by_host = {host.lower(): rule for rule in sites for host in rule.hosts}
+
+    @classmethod
+    def load(cls, path: str = RULES_PATH) -> "ExtractorRegistry":
+        """Loads and compiles a rule set from a JSON data file"""
+        with open(path, 'r') as file:
+            data = json.load(file)
+        generic = SiteRule.from_dict('generic', [], data['generic'])
+        sites = [SiteRule.from_dict(site['name'], site['hosts'], site['fields'])
+                 for site in data.get('sites', [])]
+        return cls(generic, sites)
+
+    def for_url(self, url: Optional[str]) -> Optional[SiteRule]:
+        """Returns the rule for a URL's host or any parent domain, if one is registered"""
+        if not url:
+            return None
+        labels = (urlparse(url).hostname or '').lower().split('.')
+        for i in range(len(labels) - 1):
+            rule = self._by_host.get('.'.join(labels[i:]))
+            if rule:
+                return rule
+        return None
+
+_registry = None
+
+def get_registry() -> ExtractorRegistry:
+    """Returns the extractor registry loaded from extraction_rules.json"""
+    global _registry
+    if _registry is None:
+        _registry = ExtractorRegistry.load()
+    return _registry
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _find_job_posting(data):
+    """Finds the first JobPosting object in parsed JSON-LD, including @graph"""
+    for item in _as_list(data):
+        if not isinstance(item, dict):
+            continue
+        if 'JobPosting' in _as_list(item.get('@type')):
+            return item
+        found = _find_job_posting(item.get('@graph'))
+        if found:
+            return found
+    return None
+
+def _format_location(job_location) -> str:
+    locations = []
+    for place in _as_list(job_location):
+        address = place.get('address', {}) if isinstance(place, dict) else {}
+        if isinstance(address, str):
+            locations.append(address)
+            continue
+        parts = [address.get(key) for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+        parts = [part.get('name', '') if isinstance(part, dict) else part for part in parts]
+        text = ', '.join(part for part in parts if part)
+        if text:
+            locations.append(text)
+    return '; '.join(locations)
+
+def extract_json_ld(soup: "BeautifulSoup") -> dict:
+    """Returns job fields from a schema.org JobPosting block, if the page has one"""
+    for script in soup.find_all('script', attrs={'type': 'application/ld+json'}):
+        try:
+            posting = _find_job_posting(json.loads(script.string or ''))
+        except ValueError:
+            continue
+        if not posting:
+            continue
+        organization = posting.get('hiringOrganization')
+        # The description is usually HTML, sometimes entity-escaped HTML
+        description = html.unescape(posting.get('description') or '')
+        if '<' in description:
+            description = make_soup(description).get_text('\n')
+        return {
+            'title': (posting.get('title') or '').strip(),
+            'company': (organization.get('name', '') if isinstance(organization, dict)
+                        else organization or '').strip(),
+            'location': _format_location(posting.get('jobLocation')),
+            'description': description.strip()
+        }
+    return {}
+
+def extract_job_details(markup: str, url: Optional[str] = None) -> dict:
+    """Extracts title, company, location and description from a job posting page"""
+    soup = make_soup(markup)
+    registry = get_registry()
+    site = registry.for_url(url)
+
+    # Structured data is the cheapest and most reliable source when present
+    details = extract_json_ld(soup)
+
+    # Known boards resolve with targeted selectors, everything else falls back
+    # to the generic rules
+    for key in FIELDS:
+        if details.get(key):
+            continue
+        # Descriptions keep one line per block element so they can be
+        # condensed line by line later
+        separator = '\n' if key == 'description' else ''
+        value = site.select_text(soup, key, separator) if site else ''
+        details[key] = value or registry.generic.select_text(soup, key, separator)
+
+    # If we couldn't find the description with specific selectors, fall back
+    # to the largest text content block on the page
+    if not details['description']:
+        block = largest_text_block(soup)
+        if block is not None:
+            details['description'] = block.get_text('\n').strip()
+
+    return {
+        'title': details['title'] or 'Position Title Not Found',
+        'company': details['company'] or 'Company Name Not Found',
+        'location': details['location'] or 'Location Not Found',
+        'description': details['description'] or 'Job Description Not Found'
+    }
@@ -0,0 +1,237 @@
+"""
+Pooled HTTP fetching with an on-disk response cache
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from tracing import span
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (
+    float(os.getenv('JOB_FETCH_CONNECT_TIMEOUT', '5')),
+    float(os.getenv('JOB_FETCH_READ_TIMEOUT', '30'))
+)
+DEFAULT_CACHE_DIR = os.getenv('JOB_FETCH_CACHE_DIR', os.path.join('.cache', 'http'))
+DEFAULT_CACHE_TTL = float(os.getenv('JOB_FETCH_CACHE_TTL', str(6 * 60 * 60)))
+# Minimum seconds between eviction sweeps triggered by new responses
+DEFAULT_EVICT_INTERVAL = 60 * 60
+
+@dataclass
+class FetchResult:
+    """Body and provenance of a fetched page"""
+    url: str
+    text: str
+    status: int
+    from_cache: bool
+    revalidated: bool = False
+
+class ResponseCache:
+    """Content-addressed disk cache for HTTP responses
+
+    Bodies are stored once under the SHA-256 of their bytes, and a small JSON
+    entry per URL records the body hash along with the ETag/Last-Modified
+    validators. Entries younger than ttl are served without any network
+    access; older ones are revalidated with a conditional request and are
+    evicted entirely once they pass max_age. Storing a response sweeps the
+    cache at most once per evict_interval.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_CACHE_TTL,
+                 max_age: Optional[float] = None, evict_interval: float = DEFAULT_EVICT_INTERVAL):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age if max_age is not None else ttl * 28
+        self.evict_interval = evict_interval
+        self._last_evicted = 0.0
+        # Keeps a sweep from deleting a body whose entry is still being written
+        self._lock = threading.Lock()
+        self._entries_dir = os.path.join(directory, 'entries')
+        self._bodies_dir = os.path.join(directory, 'bodies')
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._bodies_dir, exist_ok=True)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self._entries_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self._bodies_dir, body_hash)
+
+    def get(self, url: str) -> Optional[dict]:
+        """Returns the cache entry for a URL, or None if missing or unreadable"""
+        try:
+            with open(self._entry_path(url), 'r') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._body_path(entry['body_hash'])):
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def read_body(self, entry: dict) -> bytes:
+        with open(self._body_path(entry['body_hash']), 'rb') as file:
+            return file.read()
+
+    def put(self, url: str, body: bytes, encoding: Optional[str], headers) -> dict:
+        """Stores a response body and its validators, returning the new entry"""
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(body_hash)
+        entry = {
+            'url': url,
+            'body_hash': body_hash,
+            'encoding': encoding,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time()
+        }
+        with self._lock:
+            if not os.path.exists(body_path):
+                self._atomic_write(body_path, body)
+            self._write_entry(url, entry)
+        self._evict_if_due()
+        return entry
+
+    def touch(self, url: str, entry: dict) -> dict:
+        """Marks an entry fresh again after a 304 Not Modified"""
+        entry = dict(entry, stored_at=time.time())
+        self._write_entry(url, entry)
+        return entry
+
+    def evict(self) -> int:
+        """Removes entries older than max_age and bodies no entry refers to"""
+        removed = 0
+        referenced = set()
+        with self._lock:
+            self._last_evicted = now = time.time()
+            for name in os.listdir(self._entries_dir):
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(self._entries_dir, name)
+                try:
+                    with open(path, 'r') as file:
+                        entry = json.load(file)
+                except (OSError, ValueError):
+                    entry = None
+                if entry is None or now - entry['stored_at'] > self.max_age:
+                    _remove(path)
+                    removed += 1
+                else:
+                    referenced.add(entry['body_hash'])
+            for name in os.listdir(self._bodies_dir):
+                if name not in referenced and not name.endswith('.tmp'):
+                    _remove(os.path.join(self._bodies_dir, name))
+        return removed
+
+    def _evict_if_due(self):
+        if time.time() - self._last_evicted >= self.evict_interval:
+            self.evict()
+
+    def _write_entry(self, url: str, entry: dict):
+        self._atomic_write(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        # Swept by another process sharing the cache directory
+        pass
+
+class Fetcher:
+    """Fetches pages over a shared connection pool, consulting the disk cache first"""
+
+    def __init__(self, cache: Optional[ResponseCache] = None, timeout=DEFAULT_TIMEOUT,
+                 pool_size: int = 32):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str, refresh: bool = False) -> FetchResult:
+        """Returns the page at url, from cache when it is still fresh"""
+        with span('fetch', url=url) as current:
+            result = self._fetch(url, refresh)
+            if current is not None:
+                current.attributes.update(status=result.status, from_cache=result.from_cache,
+                                          revalidated=result.revalidated)
+            return result
+
+    def _fetch(self, url: str, refresh: bool) -> FetchResult:
+        entry = self.cache.get(url) if self.cache and not refresh else None
+        if entry and self.cache.is_fresh(entry):
+            return self._from_entry(url, entry, revalidated=False)
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if entry and response.status_code == 304:
+            return self._from_entry(url, self.cache.touch(url, entry), revalidated=True)
+        response.raise_for_status()
+
+        encoding = response.encoding or response.apparent_encoding
+        if self.cache:
+            self.cache.put(url, response.content, encoding, response.headers)
+        return FetchResult(url, response.content.decode(encoding or 'utf-8', errors='replace'),
+                           response.status_code, from_cache=False)
+
+    async def fetch_async(self, url: str, refresh: bool = False) -> FetchResult:
+        """Async variant of fetch that runs the pooled request off the event loop"""
+        import asyncio
+        return await asyncio.to_thread(self.fetch, url, refresh)
+
+    async def fetch_many(self, urls: List[str], concurrency: int = 8) -> List[object]:
+        """Fetches many URLs concurrently; failures are returned as exceptions"""
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(url):
+            async with semaphore:
+                return await self.fetch_async(url)
+
+        return await asyncio.gather(*(bounded(url) for url in urls), return_exceptions=True)
+
+    def _from_entry(self, url: str, entry: dict, revalidated: bool) -> FetchResult:
+        body = self.cache.read_body(entry)
+        text = body.decode(entry.get('encoding') or 'utf-8', errors='replace')
+        return FetchResult(url, text, 200, from_cache=True, revalidated=revalidated)
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+def get_fetcher() -> Fetcher:
+    """Returns the process-wide fetcher shared by all tools and crews"""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher(cache=ResponseCache())
+        return _default_fetcher
+
+def fetch_text(url: str, refresh: bool = False) -> str:
+    """Returns the text of a page using the shared fetcher"""
+    return get_fetcher().fetch(url, refresh=refresh).text
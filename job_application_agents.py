@@ -1,28 +1,92 @@
-from dotenv import load_dotenv
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
-from langchain.tools import tool
-import requests
+# Heavy dependencies (crewai, langchain, openai, weasyprint, bs4) are imported
+# inside the functions that need them so the CLI, tools and models load fast
+import argparse
+import functools
 import os
-from bs4 import BeautifulSoup
 import json
-import re
-from pathlib import Path
-from datetime import date
+import threading
+import time
 from models import CV, CoverLetter
-from weasyprint import HTML
-from PIL import Image
-from pdf2image import convert_from_bytes
-from pybars import Compiler
+from base_documents import load_base_cv, load_base_cover_letter
+from rendering import collect_application, render_application, submit_document
+from render_pool import get_render_pool
+from fetching import fetch_text
+from extraction import extract_job_details
+from condense import condense_description
+from structured_output import format_output_stats, repair, schema_instructions, validate_output
+from task_graph import TaskTiming, run_task_graph, format_timings
+from checkpoints import CheckpointStore
+from tracing import Tracer, format_summary, span, token_callback, token_usage, trace
+import events
 
-# Load environment variables
-load_dotenv()
+MODEL_NAME = "gpt-4-turbo-preview"
+MODEL_TEMPERATURE = 0.7
 
-# Initialize the LLM
-model = ChatOpenAI(model_name="gpt-4-turbo-preview", temperature=0.7)
+_openai_client = None
+_openai_client_lock = threading.Lock()
+_llms = {}
+_llm_lock = threading.Lock()
+
+def get_openai_client() -> "openai.OpenAI":
+    """Returns the process-wide OpenAI client whose connection pool all chat models share"""
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            import openai
+            from dotenv import load_dotenv
+
+            # Load environment variables
+            load_dotenv()
+            _openai_client = openai.OpenAI()
+        return _openai_client
+
+def get_llm(model_name: str = MODEL_NAME, temperature: float = MODEL_TEMPERATURE,
+            streaming: bool = False) -> "ChatOpenAI":
+    """Returns a shared chat model, built once per model name, temperature and mode
+
+    Responses are cached on disk, so repeating a call for an unchanged job
+    posting costs no tokens. A streaming model emits each token it receives
+    as an event; cached responses arrive whole. A model registered with
+    ``set_llm()`` is returned as is, without an OpenAI client or API key.
+    """
+    key = (model_name, temperature, streaming)
+    with _llm_lock:
+        if key not in _llms:
+            from langchain_openai import ChatOpenAI
+            from llm_cache import get_llm_cache
+
+            client = get_openai_client()
+            callbacks = [token_callback()]
+            if streaming:
+                callbacks.append(events.token_stream_callback())
+            _llms[key] = ChatOpenAI(model_name=model_name, temperature=temperature,
+                                    client=client.chat.completions, cache=get_llm_cache(),
+                                    streaming=streaming, callbacks=callbacks)
+        return _llms[key]
+
+def set_llm(llm, model_name: str = MODEL_NAME, temperature: float = MODEL_TEMPERATURE,
+            streaming: bool = False):
+    """Makes get_llm return llm for these settings, e.g. a stub model for offline runs"""
+    with _llm_lock:
+        _llms[(model_name, temperature, streaming)] = llm
+
+def memoized_agent(method):
+    """Builds an agent the first time a crew asks for it and reuses it afterwards"""
+    @functools.wraps(method)
+    def wrapper(self):
+        agents = self.__dict__.setdefault('_agents', {})
+        if method.__name__ not in agents:
+            agents[method.__name__] = method(self)
+        return agents[method.__name__]
+    return wrapper
+
+@functools.lru_cache(maxsize=None)
+def as_tool(func):
+    """Wraps a plain function as a LangChain tool the first time an agent needs it"""
+    from langchain.tools import tool
+    return tool(func)
 
 # Tools
-@tool
 def read_text_file(file_path: str):
     """
     Reads a text file and returns the content 
@@ -33,7 +97,6 @@ def read_text_file(file_path: str):
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
-@tool
 def write_text_file(file_path: str, content: str):
     """
     Writes content to a text file
@@ -47,143 +110,93 @@ def write_text_file(file_path: str, content: str):
     except Exception as e:
         return f"Error writing file: {str(e)}"
 
-@tool
 def get_webpage_contents(url: str):
     """
     Reads the webpage with a given URL and returns the page content
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Try multiple common selectors for job details
-        title = ''
-        company = ''
-        location = ''
-        description = ''
-
-        # Title selectors
-        title_selectors = ['h1', '.job-title', '.position-title', '[data-testid="job-title"]']
-        for selector in title_selectors:
-            element = soup.select_one(selector)
-            if element:
-                title = element.text.strip()
-                break
-
-        # Company selectors
-        company_selectors = ['.company-name', '.employer', '[data-testid="company-name"]']
-        for selector in company_selectors:
-            element = soup.select_one(selector)
-            if element:
-                company = element.text.strip()
-                break
-
-        # Location selectors
-        location_selectors = ['.location', '.job-location', '[data-testid="location"]']
-        for selector in location_selectors:
-            element = soup.select_one(selector)
-            if element:
-                location = element.text.strip()
-                break
-
-        # Description selectors
-        description_selectors = ['.job-description', '.description', '#job-description', '[data-testid="job-description"]']
-        for selector in description_selectors:
-            element = soup.select_one(selector)
-            if element:
-                description = element.text.strip()
-                break
-
-        # If we couldn't find the description with specific selectors, try to get the main content
-        if not description:
-            # Try to get the largest text content block
-            content_blocks = soup.find_all(['div', 'section', 'article'])
-            if content_blocks:
-                # Sort by content length and get the largest
-                description = max(content_blocks, key=lambda x: len(x.text.strip())).text.strip()
-
-        job_content = {
-            'title': title or 'Position Title Not Found',
-            'company': company or 'Company Name Not Found',
-            'location': location or 'Location Not Found',
-            'description': description or 'Job Description Not Found'
-        }
-        
+        page = fetch_text(url)
+        with span('extract', url=url):
+            job_content = extract_job_details(page, url)
+            job_content['description'] = condense_description(job_content['description'])
         return json.dumps(job_content, indent=2)
     except Exception as e:
         return f"Error fetching webpage: {str(e)}"
 
-@tool
 def render_and_save_documents(cv_data: dict, cover_letter_data: dict, output_dir: str):
     """Renders and saves CV and Cover Letter as PDF and JPEG"""
     try:
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Validate data using Pydantic models
-        cv = CV(**cv_data)
-        cover_letter = CoverLetter(**cover_letter_data)
-        
-        def render_template(template_path, data):
-            with open(template_path, 'r') as file:
-                template_content = file.read()
-            compiler = Compiler()
-            template = compiler.compile(template_content)
-            return template(data.model_dump())
-        
-        def html_to_jpeg(html_content, output_path):
-            pdf = HTML(string=html_content).write_pdf()
-            images = convert_from_bytes(pdf)
-            if images:
-                images[0].save(output_path, 'JPEG', quality=95)
-        
-        def html_to_pdf(html_content, output_path):
-            HTML(string=html_content).write_pdf(output_path)
-        
-        # Process CV
-        cv_template_path = "templates/cv_template.html"
-        cv_html = render_template(cv_template_path, cv)
-        
-        cv_jpg_path = os.path.join(output_dir, "cv.jpg")
-        cv_pdf_path = os.path.join(output_dir, "cv.pdf")
-        
-        html_to_jpeg(cv_html, cv_jpg_path)
-        html_to_pdf(cv_html, cv_pdf_path)
-        
-        # Process Cover Letter
-        cl_template_path = "templates/cover_letter_template.html"
-        cl_html = render_template(cl_template_path, cover_letter)
-        
-        cl_jpg_path = os.path.join(output_dir, "cover_letter.jpg")
-        cl_pdf_path = os.path.join(output_dir, "cover_letter.pdf")
-        
-        html_to_jpeg(cl_html, cl_jpg_path)
-        html_to_pdf(cl_html, cl_pdf_path)
-        
-        return json.dumps({
-            "success": True,
-            "files": {
-                "cv_jpg": cv_jpg_path,
-                "cv_pdf": cv_pdf_path,
-                "cover_letter_jpg": cl_jpg_path,
-                "cover_letter_pdf": cl_pdf_path
-            }
-        })
+        # Validate data using Pydantic models, fixing over-long fields locally
+        cv = repair(cv_data, CV)[0] or CV(**cv_data)
+        cover_letter = repair(cover_letter_data, CoverLetter)[0] or CoverLetter(**cover_letter_data)
+        return json.dumps(render_application(cv, cover_letter, output_dir))
     except Exception as e:
         return json.dumps({
             "success": False,
             "error": str(e)
         })
 
+TASK_NAMES = ['extract_job', 'create_cv', 'create_cover_letter', 'process_documents']
+
+def checkpointed(store: CheckpointStore, name: str, callback=None):
+    """Wraps a task callback so the task's final output is saved once it is accepted"""
+    def save(output):
+        if callback:
+            callback(output)
+        store.save(name, output.result)
+    return save
+
+TASK_EVENTS = {
+    'extract_job': events.JOB_EXTRACTED,
+    'create_cv': events.CV_READY,
+    'create_cover_letter': events.COVER_LETTER_READY,
+    'process_documents': events.DOCUMENTS_PROCESSED
+}
+
+# Validated document model names and the documents they are rendered as
+RENDERED_DOCUMENTS = {'CV': 'cv', 'CoverLetter': 'cover_letter'}
+WRITER_TASKS = {'create_cv': 'CV', 'create_cover_letter': 'CoverLetter'}
+
+def announced(name: str, callback=None):
+    """Wraps a task callback so the task's accepted output is emitted as an event"""
+    def announce(output):
+        if callback:
+            callback(output)
+        events.emit(TASK_EVENTS[name], task=name, result=output.result)
+    return announce
+
 class JobApplicationCrew:
-    def __init__(self):
-        self.model = ChatOpenAI(model_name="gpt-4-turbo-preview", temperature=0.7)
+    def __init__(self, use_document_agent: bool = False, parallel: bool = True,
+                 stream_tokens: bool = False):
+        self.model = get_llm()
+        # Writers stream their answers token by token when asked to; the
+        # answers are the same either way
+        self.writer_model = get_llm(streaming=True) if stream_tokens else self.model
+        # Rendering is deterministic, so by default it runs in-process instead
+        # of costing a document processor LLM round trip
+        self.use_document_agent = use_document_agent
+        # Run tasks whose context is satisfied concurrently instead of in
+        # crew order, so the CV and cover letter are written side by side
+        self.parallel = parallel
+        self.task_timings = []
+        # Validated writer output and what it took to get it, per model name
+        self.documents = {}
+        self.output_reports = {}
+        self.token_usage = {}
+        self.tracer = None
+        self.trace_summary = {}
+        # Seconds from the start of a run until its first PDF and JPEG were written
+        self.first_artifact_seconds = None
+        self.output_dir = None
+        self._renders = {}
+        self._started = 0.0
+        self._stream_thread = None
+        self._artifact_lock = threading.Lock()
         
-    def job_crawler(self) -> Agent:
+    @memoized_agent
+    def job_crawler(self) -> "Agent":
+        from crewai import Agent
+
         return Agent(
             role='Job Description Crawler',
             goal='Extract and analyze job posting information',
@@ -191,17 +204,21 @@ class JobApplicationCrew:
             You focus on identifying essential requirements, qualifications, responsibilities, and company details.
             You also ensure proper formatting of company and job information for file organization.""",
             verbose=True,
-            tools=[get_webpage_contents, read_text_file],
+            tools=[as_tool(get_webpage_contents), as_tool(read_text_file)],
             allow_delegation=False,
+            memory=False,
             llm=self.model
         )
 
-    def cv_writer(self) -> Agent:
+    @memoized_agent
+    def cv_writer(self) -> "Agent":
+        from crewai import Agent
+
         return Agent(
             role='CV Writer',
             goal='Create a professional CV that matches job requirements while maintaining authenticity',
             backstory="""You are an experienced CV writer who specializes in creating compelling CVs that match job requirements.
-            You understand the Pydantic model requirements and ensure all data fits within specified constraints.
+            You write JSON that satisfies the CV schema you are given, including every length limit.
             
             Key guidelines:
             1. NEVER make up or fabricate specific metrics or statistics
@@ -209,36 +226,18 @@ class JobApplicationCrew:
             3. Use clear, professional language to describe experience
             4. Maintain consistent formatting and style
             5. Ensure content is authentic and verifiable
-            
-            You understand the following constraints:
-            - full_name: 1-50 characters (use full capacity)
-            - job_title: 1-50 characters (use full capacity)
-            - location: 1-50 characters (use full capacity)
-            - email: valid email format
-            - phone: 10-20 characters
-            - linkedin: 1-100 characters (use full capacity)
-            - professional_summary: 50-300 characters (aim for 250-300)
-            - technical_skills: 1-5 items, each with:
-              - category: 1-30 characters (use 20-30)
-              - skills: 1-150 characters (aim for 100-150)
-            - experience: 1-3 items, each with:
-              - job_title: 1-50 characters (use full capacity)
-              - company: 1-50 characters (use full capacity)
-              - date_range: 1-30 characters (use full capacity)
-              - responsibilities: 1-3 items, each 1-120 characters (aim for 100-120)
-            - education: 1-2 items, each with:
-              - degree: 1-50 characters (use full capacity)
-              - institution: 1-50 characters (use full capacity)
-              - year: 4 characters
-              - achievements: 0-2 items, each 1-100 characters (aim for 80-100)
-            - certifications: 0-5 items, each 1-40 characters (use 30-40)""",
+            6. Use most of each field's maximum length without going over it""",
             verbose=True,
-            tools=[read_text_file],
+            tools=[],
             allow_delegation=False,
-            llm=self.model
+            memory=False,
+            llm=self.writer_model
         )
 
-    def cover_letter_writer(self) -> Agent:
+    @memoized_agent
+    def cover_letter_writer(self) -> "Agent":
+        from crewai import Agent
+
         return Agent(
             role='Cover Letter Writer',
             goal='Create authentic and compelling cover letters that highlight relevant qualifications',
@@ -251,32 +250,18 @@ class JobApplicationCrew:
             3. Use specific examples without quantification
             4. Maintain professional and genuine tone
             5. Highlight relevant experience without exaggeration
-            
-            You understand the following constraints:
-            - full_name: 1-50 characters
-            - address: 1-100 characters
-            - city: 1-50 characters
-            - state: 2 characters
-            - zip: 5-10 characters
-            - email: valid email format
-            - phone: 10-20 characters
-            - date: valid date format
-            - hiring_manager_name: 1-50 characters
-            - job_title: 1-50 characters
-            - company_name: 1-50 characters
-            - company_address: 1-100 characters
-            - company_city: 1-50 characters
-            - company_state: 2 characters
-            - company_zip: 5-10 characters
-            - paragraphs: 3 items, each 50-800 characters
-            - closing_paragraph: 20-300 characters""",
+            6. Write JSON that satisfies the CoverLetter schema you are given, including every length limit""",
             verbose=True,
-            tools=[read_text_file],
+            tools=[],
             allow_delegation=False,
-            llm=self.model
+            memory=False,
+            llm=self.writer_model
         )
 
-    def document_processor(self) -> Agent:
+    @memoized_agent
+    def document_processor(self) -> "Agent":
+        from crewai import Agent
+
         return Agent(
             role='Document Processor',
             goal='Generate professionally formatted PDF and JPEG versions of the CV and cover letter',
@@ -291,12 +276,15 @@ class JobApplicationCrew:
             4. Optimize readability
             5. Generate high-quality output files""",
             verbose=True,
-            tools=[render_and_save_documents],
+            tools=[as_tool(render_and_save_documents)],
             allow_delegation=False,
+            memory=False,
             llm=self.model
         )
 
     def create_tasks(self, job_url: str, output_dir: str) -> list:
+        from crewai import Task
+
         task_extract_job = Task(
             description=f"""Extract key information from the job posting at {job_url}.
             Focus on required skills, qualifications, responsibilities, and company culture.
@@ -304,33 +292,44 @@ class JobApplicationCrew:
             1. Job requirements and qualifications
             2. Company details and culture
             3. Role responsibilities
+            Summarize each point in a few words instead of copying the posting text;
+            the other agents only see this summary.
             Format the output in JSON format for other agents to use.""",
-            expected_output="A JSON string containing structured job posting information",
+            expected_output="A concise JSON summary of the job posting",
             agent=self.job_crawler()
         )
 
         task_create_cv = Task(
-            description="""Create a CV that matches the job requirements.
-            First, read the base CV from CV.txt using the read_text_file tool.
-            Then, modify the content to match the job requirements while following the Pydantic model structure.
-            Ensure all content fits within the specified length constraints.
-            Return the CV data in valid JSON format that matches the CV model.""",
-            expected_output="A JSON string containing CV data that matches the CV Pydantic model",
+            description=f"""Create a CV that matches the job requirements.
+            Start from the candidate's base CV below and modify its content to match the job requirements.
+            Base CV:
+            {load_base_cv().model_dump_json()}
+            Your final answer must be a single JSON object that validates against this JSON schema:
+            {schema_instructions(CV)}""",
+            expected_output="A JSON object that validates against the CV schema",
             agent=self.cv_writer(),
-            context=[task_extract_job]
+            context=[task_extract_job],
+            callback=self.output_validator(CV)
         )
 
         task_create_cover_letter = Task(
-            description="""Create a cover letter that highlights relevant qualifications.
-            First, read the base cover letter from Cover_Letter.txt using the read_text_file tool.
-            Then, modify the content to match the job requirements while following the Pydantic model structure.
-            Ensure all content fits within the specified length constraints.
-            Return the cover letter data in valid JSON format that matches the CoverLetter model.""",
-            expected_output="A JSON string containing cover letter data that matches the CoverLetter Pydantic model",
+            description=f"""Create a cover letter that highlights relevant qualifications.
+            Start from the candidate's base cover letter below and modify its content to match the job requirements,
+            replacing every bracketed placeholder with details of this job.
+            Base cover letter:
+            {load_base_cover_letter().model_dump_json()}
+            Your final answer must be a single JSON object that validates against this JSON schema:
+            {schema_instructions(CoverLetter)}""",
+            expected_output="A JSON object that validates against the CoverLetter schema",
             agent=self.cover_letter_writer(),
-            context=[task_extract_job]
+            context=[task_extract_job],
+            callback=self.output_validator(CoverLetter)
         )
 
+        tasks = [task_extract_job, task_create_cv, task_create_cover_letter]
+        if not self.use_document_agent:
+            return tasks
+
         task_process_documents = Task(
             description=f"""Generate PDF and JPEG versions of the CV and cover letter.
             Use the provided templates and save to the output directory: {output_dir}
@@ -338,12 +337,268 @@ class JobApplicationCrew:
             Ensure professional formatting and appearance.""",
             expected_output="A JSON string containing the paths to the generated PDF and JPEG files",
             agent=self.document_processor(),
-            context=[task_extract_job, task_create_cv, task_create_cover_letter]
+            # Rendering needs only the documents, not the job summary
+            context=[task_create_cv, task_create_cover_letter]
         )
 
-        return [task_extract_job, task_create_cv, task_create_cover_letter, task_process_documents]
+        return tasks + [task_process_documents]
+
+    def output_validator(self, model_cls):
+        """Returns a task callback that validates and repairs a writer's answer
+
+        It runs as soon as the task finishes, so an unusable answer fails the
+        run before any further LLM spend, and downstream tasks receive the
+        repaired JSON instead of the raw answer.
+        """
+        def validate(output):
+            model, report = validate_output(output.result, model_cls, llm=self.model)
+            self.documents[model_cls.__name__] = model
+            self.output_reports[model_cls.__name__] = report
+            output.result = model.model_dump_json(indent=2)
+        return validate
+
+    def reset_agents(self):
+        """Gives the memoized agents fresh tool state for a new run
+
+        crewai remembers each agent's last tool call and caches tool output
+        in memory. Carried over to the next run for the same posting, that
+        makes the crawler's first fetch look like a repeated call, which it
+        is told to stop making, and would serve pages the HTTP cache has
+        since refreshed.
+        """
+        from crewai.agents import CacheHandler
+
+        for agent in self.__dict__.get('_agents', {}).values():
+            agent.set_cache_handler(CacheHandler())
+
+    def rendered(self, model_name: str, callback):
+        """Wraps a writer's task callback so its document starts rendering once accepted
+
+        The CV's PDF can then exist before the cover letter is even written.
+        """
+        def render(output):
+            callback(output)
+            self.start_render(RENDERED_DOCUMENTS[model_name], self.documents[model_name])
+        return render
+
+    def start_render(self, document: str, model) -> "Future":
+        """Submits a validated document for rendering and reports its files once written"""
+        future = submit_document(document, model, self.output_dir)
+        # Render callbacks run on the pool's thread, outside the run's context
+        stream = events.current_stream()
+
+        def written(done):
+            if done.exception() is None:
+                self.artifact_written(document, done.result(), stream)
+
+        self._renders[document] = future
+        future.add_done_callback(written)
+        return future
+
+    def artifact_written(self, document: str, result, stream=None):
+        with self._artifact_lock:
+            if self.first_artifact_seconds is None:
+                self.first_artifact_seconds = time.perf_counter() - self._started
+        if stream is not None:
+            for format, path in (('pdf', result.pdf_path), ('jpeg', result.jpg_path)):
+                stream.emit(events.ARTIFACT_WRITTEN, document=document, format=format,
+                            path=path, cached=result.cached)
+
+    def job_cache_scope(self, job_url: str, refresh: bool = False):
+        """Scopes cached LLM responses to the current content of the job posting
+
+        The posting is fetched up front, which also warms the HTTP cache for
+        the crawler's tool call. If it cannot be fetched there is nothing
+        safe to key on, so caching is bypassed for the run.
+        """
+        from llm_cache import cache_scope, job_content_key
+
+        try:
+            details = extract_job_details(fetch_text(job_url, refresh=refresh), job_url)
+        except Exception:
+            return cache_scope(enabled=False)
+        return cache_scope(job_content_key(json.dumps(details, sort_keys=True)), refresh=refresh)
+
+    def run(self, job_url: str, output_dir: str, verbose: bool = True, refresh: bool = False,
+            resume: bool = False) -> str:
+        """Runs the full application pipeline for a single job posting
+
+        refresh ignores cached pages and LLM responses, storing fresh ones.
+        Every task's output is checkpointed in output_dir as it finishes, and
+        resume reuses those checkpoints so only the tasks that did not finish,
+        and the tasks downstream of them, run again. Progress is emitted to
+        the current event stream, see ``stream()``.
+        """
+        # Invalid base documents fail here, before anything is fetched or paid for
+        load_base_cv()
+        load_base_cover_letter()
+        os.makedirs(output_dir, exist_ok=True)
+        if not self.use_document_agent:
+            # Render workers start while the LLM works, so the first document
+            # does not wait for them
+            get_render_pool().warm()
+        self.reset_agents()
+        # Cleared up front so a failed run never reports the previous run's figures
+        self.documents = {}
+        self.output_reports = {}
+        self.task_timings = []
+        self.token_usage = {}
+        self.output_dir = output_dir
+        self.first_artifact_seconds = None
+        self._renders = {}
+        self._started = time.perf_counter()
+        self.tracer = Tracer()
+        try:
+            with trace(self.tracer), span('application', url=job_url) as application:
+                with self.job_cache_scope(job_url, refresh):
+                    result = self._run(job_url, output_dir, verbose, resume)
+                if application is not None and self.first_artifact_seconds is not None:
+                    application.attributes['first_artifact_seconds'] = round(self.first_artifact_seconds, 3)
+        finally:
+            self.tracer.export_jsonl(os.path.join(output_dir, 'trace.jsonl'))
+            self.trace_summary = self.tracer.summary()
+            # Taken from the trace, which unlike OpenAI's usage callback also
+            # counts streamed responses, and covers failed runs up to the failure
+            self.token_usage = token_usage(self.trace_summary)
+        return result
+
+    def stream(self, job_url: str, output_dir: str, **kwargs) -> "Iterator[events.Event]":
+        """Runs the pipeline in a background thread, yielding events as stages finish
+
+        Yields a job_extracted, cv_ready and cover_letter_ready event as each
+        task's output is accepted, an artifact_written event per PDF and
+        JPEG as soon as it exists, and token events while the writers stream.
+        The last event is either done, carrying the result, or error. Keyword
+        arguments are those of ``run()``. Closing the generator early does not
+        wait for the run; it finishes in the background, and the next
+        ``stream()`` on this crew waits for it before starting.
+        """
+        if self._stream_thread is not None:
+            self._stream_thread.join()
+        stream = events.EventStream()
+
+        def target():
+            try:
+                with events.streaming(stream):
+                    result = self.run(job_url, output_dir, **kwargs)
+                stream.emit(events.DONE, result=result, first_artifact_seconds=self.first_artifact_seconds)
+            except Exception as e:
+                stream.emit(events.ERROR, error=str(e))
+            finally:
+                stream.close()
+
+        thread = self._stream_thread = threading.Thread(target=target, name='job-application-stream',
+                                                        daemon=True)
+        thread.start()
+        yield from stream
+        # The stream closes as the run ends, so this returns at once. A
+        # consumer that stops early never gets here and is not held up.
+        thread.join()
+
+    def restore_checkpoints(self, tasks: list, names: list, store: CheckpointStore) -> list:
+        """Restores checkpointed outputs and returns the tasks that still have to run
+
+        A task is only restored when everything in its context was restored
+        too, so anything downstream of a task that runs again is re-run.
+        Tasks are in dependency order, which makes one pass enough.
+        """
+        from crewai.tasks.task_output import TaskOutput
+
+        restored = set()
+        remaining = []
+        for task, name in zip(tasks, names):
+            result = store.load(name)
+            if result is None or any(id(dep) not in restored for dep in task.context or []):
+                remaining.append(task)
+                continue
+            task.output = TaskOutput(description=task.description, result=result)
+            if task.callback:
+                # Rebuilds the validated documents from the saved output
+                task.callback(task.output)
+            restored.add(id(task))
+        return remaining
+
+    def _run(self, job_url: str, output_dir: str, verbose: bool, resume: bool = False) -> str:
+        tasks = self.create_tasks(job_url, output_dir)
+        names = TASK_NAMES[:len(tasks)]
+        task_names = {id(task): name for task, name in zip(tasks, names)}
+
+        store = CheckpointStore(os.path.join(output_dir, 'checkpoints'), job_url)
+        if not resume:
+            store.clear()
+        for task, name in zip(tasks, names):
+            task.callback = announced(name, checkpointed(store, name, task.callback))
+            if name in WRITER_TASKS and not self.use_document_agent:
+                task.callback = self.rendered(WRITER_TASKS[name], task.callback)
+        remaining = self.restore_checkpoints(tasks, names, store) if resume else tasks
+
+        if self.parallel:
+            def execute(task):
+                name = task_names[id(task)]
+                with span(f"task.{name}"), events.task_scope(name):
+                    task.execute()
+
+            self.task_timings = run_task_graph(remaining, names=[task_names[id(task)] for task in remaining],
+                                               execute=execute)
+        else:
+            from crewai import Crew
+
+            self.task_timings = []
+            if remaining:
+                crew = Crew(
+                    agents=[task.agent for task in remaining],
+                    tasks=remaining,
+                    verbose=verbose
+                )
+                # Crew runs the tasks itself, so they share one span
+                with span('crew.kickoff'):
+                    crew.kickoff()
+        result = tasks[-1].output.result
+        if self.use_document_agent:
+            return result
+
+        offset = max((t.finished for t in self.task_timings), default=0.0)
+        start = time.perf_counter()
+        with span('render_documents'):
+            rendered = self.render_documents(output_dir)
+        self.task_timings.append(TaskTiming('render_documents', offset, offset + time.perf_counter() - start))
+        return json.dumps(rendered)
+
+    def render_documents(self, output_dir: str) -> dict:
+        """Collects the renders of the validated writer output, starting any not yet submitted"""
+        futures = {
+            document: self._renders.get(document) or self.start_render(document, self.documents[name])
+            for name, document in RENDERED_DOCUMENTS.items()
+        }
+        return collect_application(futures, output_dir)
+
+def print_event(event: "events.Event", state: dict):
+    """Prints a streamed event; tokens are written inline under their task's name"""
+    if event.kind == events.TOKEN:
+        if state.get('task') != event.data['task']:
+            state['task'] = event.data['task']
+            print(f"\n[{event.elapsed:6.1f}s] {state['task'] or 'llm'}: ", end='')
+        print(event.data['text'], end='', flush=True)
+        return
+    state['task'] = None
+    if event.kind == events.ARTIFACT_WRITTEN:
+        cached = " (cached)" if event.data['cached'] else ""
+        print(f"\n[{event.elapsed:6.1f}s] wrote {event.data['path']}{cached}")
+    elif event.kind == events.ERROR:
+        print(f"\n[{event.elapsed:6.1f}s] failed: {event.data['error']}")
+    elif event.kind != events.DONE:
+        print(f"\n[{event.elapsed:6.1f}s] {event.kind.replace('_', ' ')}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Tailor a CV and cover letter for a job posting")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached job pages and LLM responses")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse the task outputs saved by the last run for this job")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print progress and the writers' tokens as they arrive")
+    args = parser.parse_args()
+
     # Get job URL from user
     job_url = input("\nPlease enter the job posting URL: ").strip()
     
@@ -356,31 +611,35 @@ def main():
     print(f"Output Directory: {output_dir}")
     
     # Initialize the crew
-    application_crew = JobApplicationCrew()
-    
-    # Create initial tasks
-    initial_tasks = application_crew.create_tasks(job_url, output_dir)
-
-    # Create and run the crew
-    crew = Crew(
-        agents=[
-            application_crew.job_crawler(),
-            application_crew.cv_writer(),
-            application_crew.cover_letter_writer(),
-            application_crew.document_processor()
-        ],
-        tasks=initial_tasks,
-        verbose=True
-    )
+    application_crew = JobApplicationCrew(stream_tokens=args.stream)
 
     try:
         # Run document creation
-        result = crew.kickoff()
+        if args.stream:
+            state = {}
+            for event in application_crew.stream(job_url, output_dir, refresh=args.refresh,
+                                                 resume=args.resume):
+                print_event(event, state)
+                if event.kind == events.ERROR:
+                    raise RuntimeError(event.data['error'])
+                if event.kind == events.DONE:
+                    result = event.data['result']
+        else:
+            result = application_crew.run(job_url, output_dir, refresh=args.refresh, resume=args.resume)
         print("\nFinal Result:")
         print(result)
+        if application_crew.task_timings:
+            print("\nTask Timings:")
+            print(format_timings(application_crew.task_timings))
+        print(format_output_stats(application_crew.output_reports, application_crew.token_usage))
+        if application_crew.first_artifact_seconds is not None:
+            print(f"Time to first artifact: {application_crew.first_artifact_seconds:.1f}s")
+        print("\nTrace Summary:")
+        print(format_summary(application_crew.trace_summary))
         
     except Exception as e:
         print(f"\nError during execution: {str(e)}")
+        print("Finished tasks were saved; run again with --resume to continue from them.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
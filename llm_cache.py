@@ -0,0 +1,160 @@
+"""
+Persistent prompt/response cache for the chat model
+"""
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+DEFAULT_CACHE_PATH = os.getenv('JOB_LLM_CACHE_PATH', os.path.join('.cache', 'llm.sqlite3'))
+DEFAULT_TTL = float(os.getenv('JOB_LLM_CACHE_TTL', str(7 * 24 * 60 * 60)))
+DEFAULT_MAX_BYTES = int(os.getenv('JOB_LLM_CACHE_MAX_MB', '64')) * 1024 * 1024
+
+@dataclass(frozen=True)
+class CacheScope:
+    """Per-run cache settings, carried in a context variable
+
+    job_key is a hash of the scraped job content, so responses are only
+    reused while the posting is unchanged. refresh skips lookups but still
+    stores the new responses, and enabled=False bypasses the cache.
+    """
+    job_key: str = ''
+    refresh: bool = False
+    enabled: bool = True
+
+_scope = contextvars.ContextVar('llm_cache_scope', default=CacheScope())
+
+@contextlib.contextmanager
+def cache_scope(job_key: str = '', refresh: bool = False, enabled: bool = True):
+    """Applies cache settings to every LLM call made in this context"""
+    token = _scope.set(CacheScope(job_key, refresh, enabled))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+def job_content_key(content: str) -> str:
+    """Hashes scraped job content for use as a cache scope"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+class LLMCache(BaseCache):
+    """SQLite-backed LangChain cache keyed by model settings, prompt and job
+
+    llm_string carries the model name, temperature and other call
+    parameters, and the prompt is the serialized message list. Together with
+    the job content key from the current scope they form the cache key.
+    Entries expire after ttl seconds, and the least recently used entries
+    are evicted once the stored responses exceed max_bytes.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def key(prompt: str, llm_string: str, job_key: str = '') -> str:
+        digest = hashlib.sha256()
+        for part in (llm_string, prompt, job_key):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        scope = _scope.get()
+        if not scope.enabled or scope.refresh:
+            return None
+        key = self.key(prompt, llm_string, scope.job_key)
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ? AND created > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        scope = _scope.get()
+        if not scope.enabled:
+            return
+        key = self.key(prompt, llm_string, scope.job_key)
+        response = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response), now, now)
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drops expired entries, then the least recently used until under max_bytes"""
+        with self._lock, self._connection:
+            removed = self._connection.execute(
+                "DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,)
+            ).rowcount
+            total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._connection.executemany("DELETE FROM responses WHERE key = ?", stale)
+                removed += len(stale)
+            return removed
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Returns the process-wide LLM response cache"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
@@ -75,4 +75,14 @@ class CoverLetter(BaseModel):
                 ],
                 "closing_paragraph": "Thank you for considering my application."
             }
-        } 
\ No newline at end of file
+        } 
+
+class BaseCoverLetter(CoverLetter):
+    """The candidate's base letter; job-specific fields hold placeholders until it is tailored"""
+    hiring_manager_name: str
+    job_title: str
+    company_name: str
+    company_address: str
+    company_city: str
+    company_state: str
+    company_zip: str
@@ -0,0 +1,82 @@
+"""
+JPEG previews of rendered PDFs
+"""
+import importlib.util
+import os
+from typing import List, Optional
+
+PREVIEW_DPI = int(os.getenv('JOB_PREVIEW_DPI', '200'))
+PREVIEW_QUALITY = 95
+
+# pypdfium2, which requirements.txt installs, rasterizes in-process. pdf2image is
+# the fallback for installs without it and spawns a poppler subprocess per call.
+BACKEND = 'pdfium' if importlib.util.find_spec('pypdfium2') else 'pdf2image'
+
+def _page_path(jpg_path: str, page: int, first_page: int) -> str:
+    """The first page goes to jpg_path, later pages to ``<stem>-<page>.jpg``"""
+    if page == first_page:
+        return str(jpg_path)
+    stem, ext = os.path.splitext(str(jpg_path))
+    return f"{stem}-{page}{ext}"
+
+def render_preview(pdf: bytes, jpg_path, dpi: int = PREVIEW_DPI, first_page: int = 1,
+                   last_page: Optional[int] = None, max_width: Optional[int] = None,
+                   quality: int = PREVIEW_QUALITY, backend: str = BACKEND) -> List[str]:
+    """Rasterizes a page range of a PDF to JPEG files and returns their paths
+
+    Only the requested pages are rasterized, one at a time, and each image is
+    written to disk and released before the next one is produced, so memory
+    stays bounded by a single page regardless of document length. By default
+    only the first page is rendered. max_width caps the preview width in
+    pixels by lowering the effective DPI.
+    """
+    last_page = first_page if last_page is None else last_page
+    if backend == 'pdfium':
+        return _render_pdfium(pdf, jpg_path, dpi, first_page, last_page, max_width, quality)
+    return _render_pdf2image(pdf, jpg_path, dpi, first_page, last_page, max_width, quality)
+
+def _render_pdfium(pdf, jpg_path, dpi, first_page, last_page, max_width, quality):
+    import pypdfium2
+
+    paths = []
+    document = pypdfium2.PdfDocument(pdf)
+    try:
+        for page_number in range(first_page, min(last_page, len(document)) + 1):
+            page = document[page_number - 1]
+            scale = dpi / 72
+            if max_width:
+                scale = min(scale, max_width / page.get_width())
+            image = page.render(scale=scale).to_pil()
+            path = _page_path(jpg_path, page_number, first_page)
+            image.save(path, 'JPEG', quality=quality)
+            image.close()
+            page.close()
+            paths.append(path)
+    finally:
+        document.close()
+    return paths
+
+def _render_pdf2image(pdf, jpg_path, dpi, first_page, last_page, max_width, quality):
+    from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+
+    info = pdfinfo_from_bytes(pdf) if max_width or last_page > first_page else {}
+    page_count = info.get('Pages', first_page)
+    size = None
+    if max_width:
+        # Like pdfium's min(), only ever scale down. pdfinfo reports the first
+        # page's size, and rendered documents use a single page size.
+        page_width = float(info['Page size'].split()[0])
+        if page_width * dpi / 72 > max_width:
+            size = (max_width, None)
+    paths = []
+    for page_number in range(first_page, min(last_page, page_count) + 1):
+        images = convert_from_bytes(
+            pdf, dpi=dpi, first_page=page_number, last_page=page_number, size=size, fmt='jpeg'
+        )
+        if not images:
+            break
+        path = _page_path(jpg_path, page_number, first_page)
+        images[0].save(path, 'JPEG', quality=quality)
+        images[0].close()
+        paths.append(path)
+    return paths
@@ -0,0 +1,156 @@
+"""
+Relevance pre-ranking of job postings against the base CV
+
+Postings are scored with TF-IDF cosine similarity against the skills and
+experience in the CV, all at once, so only the most relevant ones are sent
+to the LLM crew.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from base_documents import BASE_CV_PATH, load_base_cv
+from models import CV
+
+# Keeps tokens like c++, c#, node.js and ci/cd together
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can
+could do does for from had has have having he her his how i if in into is it its
+job just may more most must no not of on or our out over own role same she should
+so such than that the their them then there these they this those through to too
+under up very was we were what when where which while who will with would you your
+""".split())
+
+@dataclass
+class RankedPosting:
+    """A scraped posting and its relevance to the CV"""
+    url: str
+    title: str = ''
+    company: str = ''
+    score: float = 0.0
+    error: Optional[str] = None
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def cv_profile(cv: CV) -> str:
+    """The parts of a CV that describe what the candidate can do"""
+    parts = [cv.job_title, cv.professional_summary]
+    parts += [f"{skill.category} {skill.skills}" for skill in cv.technical_skills]
+    for experience in cv.experience:
+        parts.append(experience.job_title)
+        parts.extend(experience.responsibilities)
+    parts += [education.degree for education in cv.education]
+    parts += cv.certifications
+    return "\n".join(parts)
+
+def load_profile(path: str = BASE_CV_PATH) -> str:
+    return cv_profile(load_base_cv(path))
+
+class PostingIndex:
+    """Sparse term counts of many postings, added one at a time as they are scraped
+
+    Tokenizing is the only per-posting work and happens while pages arrive.
+    The counts are kept as (posting, term, count) arrays, so scoring the
+    whole batch is a handful of NumPy reductions rather than a vector per
+    posting.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self._rows = []
+        self._columns = []
+        self._counts = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, text: str) -> int:
+        """Indexes one posting and returns its row"""
+        ids = [self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokenize(text)]
+        columns, counts = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+        self._rows.append(np.full(len(columns), len(self._rows), dtype=np.int64))
+        self._columns.append(columns)
+        self._counts.append(counts)
+        return len(self._rows) - 1
+
+    def scores(self, profile: str) -> np.ndarray:
+        """Returns the TF-IDF cosine similarity of every posting to the profile
+
+        Term frequencies are sublinear and IDF is smoothed, as in
+        scikit-learn's TfidfVectorizer.
+        """
+        size = len(self._rows)
+        if size == 0 or not self.vocabulary:
+            return np.zeros(size)
+        rows = np.concatenate(self._rows)
+        columns = np.concatenate(self._columns)
+        counts = np.concatenate(self._counts)
+
+        document_frequency = np.bincount(columns, minlength=len(self.vocabulary))
+        idf = np.log((1 + size) / (1 + document_frequency)) + 1
+        weights = (1 + np.log(counts)) * idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=size))
+
+        # Profile terms no posting uses cannot contribute to any score
+        terms, term_counts = np.unique(
+            np.asarray([self.vocabulary[token] for token in tokenize(profile) if token in self.vocabulary],
+                       dtype=np.int64),
+            return_counts=True
+        )
+        if terms.size == 0:
+            return np.zeros(size)
+        query = np.zeros(len(self.vocabulary))
+        query[terms] = (1 + np.log(term_counts)) * idf[terms]
+
+        dots = np.bincount(rows, weights=weights * query[columns], minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = dots / (norms * np.linalg.norm(query))
+        return np.nan_to_num(scores)
+
+def score_postings(documents: Sequence[str], profile: str) -> np.ndarray:
+    """Scores a list of posting texts against the profile"""
+    index = PostingIndex()
+    for document in documents:
+        index.add(document)
+    return index.scores(profile)
+
+def rank_postings(urls: Sequence[str], profile: str, concurrency: int = 8) -> List[RankedPosting]:
+    """Scrapes postings concurrently and returns them by relevance, best first
+
+    Pages come from the shared fetcher, so the crew's crawler later reads
+    them from the HTTP cache. Postings that could not be fetched sort last.
+    """
+    import asyncio
+    from extraction import extract_job_details
+    from fetching import get_fetcher
+
+    pages = asyncio.run(get_fetcher().fetch_many(list(urls), concurrency))
+    postings = []
+    index = PostingIndex()
+    for url, page in zip(urls, pages):
+        if isinstance(page, Exception):
+            postings.append(RankedPosting(url, error=str(page)))
+            continue
+        details = extract_job_details(page.text, url)
+        postings.append(RankedPosting(url, details['title'], details['company']))
+        index.add(f"{details['title']}\n{details['description']}")
+
+    scored = [posting for posting in postings if posting.error is None]
+    for posting, score in zip(scored, index.scores(profile)):
+        posting.score = float(score)
+    return sorted(postings, key=lambda posting: (posting.error is not None, -posting.score))
+
+def select_postings(ranked: List[RankedPosting], top: Optional[int] = None,
+                    min_score: Optional[float] = None) -> List[RankedPosting]:
+    """Keeps the best postings by count and/or score, never those that failed to load"""
+    selected = [posting for posting in ranked if posting.error is None]
+    if min_score is not None:
+        selected = [posting for posting in selected if posting.score >= min_score]
+    if top is not None:
+        selected = selected[:top]
+    return selected
@@ -0,0 +1,137 @@
+"""
+Content-hash cache of rendered PDF and JPEG artifacts
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.getenv('JOB_RENDER_CACHE_DIR', os.path.join('.cache', 'render'))
+DEFAULT_MAX_BYTES = int(os.getenv('JOB_RENDER_CACHE_MAX_MB', '256')) * 1024 * 1024
+
+PDF_NAME = 'document.pdf'
+JPG_NAME = 'preview.jpg'
+META_NAME = 'meta.json'
+
+def _place(source: str, destination: str, link: bool = True):
+    """Hard-links source to destination, copying when linking is not possible"""
+    if os.path.lexists(destination):
+        os.remove(destination)
+    if link:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, destination)
+
+class RenderCache:
+    """Stores rendered artifacts under a hash of everything that affects them
+
+    The key covers the validated model data, the template source and the
+    render settings, so identical inputs are restored by hard-linking (or
+    copying) the stored PDF and JPEG instead of running WeasyPrint again.
+    Restored files share storage with the cache when linked, so they must be
+    replaced rather than rewritten in place. Entries are evicted least
+    recently used first once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 link: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(model, template_path: str, settings: Optional[dict] = None) -> str:
+        """Returns the cache key for rendering a model with a template and settings"""
+        digest = hashlib.sha256()
+        digest.update(model.model_dump_json().encode('utf-8'))
+        with open(template_path, 'rb') as file:
+            digest.update(file.read())
+        digest.update(json.dumps(settings or {}, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def restore(self, key: str, pdf_path: str, jpg_path: str) -> Optional[dict]:
+        """Places cached artifacts at the given paths, returning their metadata on a hit"""
+        entry_dir = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry_dir, META_NAME), 'r') as file:
+                meta = json.load(file)
+            _place(os.path.join(entry_dir, PDF_NAME), pdf_path, self.link)
+            _place(os.path.join(entry_dir, JPG_NAME), jpg_path, self.link)
+            # Directory mtime is the recency used for eviction
+            os.utime(entry_dir)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return meta
+
+    def store(self, key: str, pdf_path: str, jpg_path: str, meta: Optional[dict] = None):
+        """Adds freshly rendered artifacts to the cache and evicts if over budget"""
+        entry_dir = os.path.join(self.directory, key)
+        if os.path.isdir(entry_dir):
+            return
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.staging-')
+        try:
+            # Copy so later changes to the output files never reach the cache
+            _place(pdf_path, os.path.join(staging, PDF_NAME), link=False)
+            _place(jpg_path, os.path.join(staging, JPG_NAME), link=False)
+            with open(os.path.join(staging, META_NAME), 'w') as file:
+                json.dump(meta or {}, file)
+            os.rename(staging, entry_dir)
+        except OSError:
+            # Another worker stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def evict(self) -> int:
+        """Removes least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name.startswith('.') or not os.path.isdir(path):
+                    continue
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+                total += size
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed += 1
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+def get_render_cache() -> RenderCache:
+    """Returns the process-wide render cache"""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = RenderCache()
+        return _render_cache
@@ -0,0 +1,87 @@
+"""
+Pool of long-lived WeasyPrint worker processes
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from preview import PREVIEW_DPI
+
+RENDER_WORKERS = int(os.getenv('JOB_RENDER_WORKERS', str(os.cpu_count() or 1)))
+
+# Laid out with the shared stylesheet so fontconfig, the parsed CSS and the
+# font stack are all loaded before the first real job arrives
+WARM_UP_HTML = "<html><body><h1>Warm up</h1><p>Warm up</p></body></html>"
+
+def _warm_up():
+    from weasyprint import HTML
+    from rendering import get_shared_styles
+
+    stylesheet, font_config = get_shared_styles()
+    HTML(string=WARM_UP_HTML).render(stylesheets=[stylesheet], font_config=font_config)
+
+def _render(html_content, pdf_path, jpg_path, preview_dpi):
+    from rendering import render_document
+    return render_document(html_content, pdf_path, jpg_path, preview_dpi)
+
+class RenderPool:
+    """Renders documents on warm worker processes so layouts run on every core
+
+    Layout is CPU-bound and holds the GIL, so concurrent renders in one
+    process serialize. Workers are started once, warmed up with fonts and
+    stylesheets loaded, and reused for every job. With workers=0 jobs run
+    inline in the calling process.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._warmed = False
+        if workers > 0:
+            # spawn keeps workers independent of threads running in the parent
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_up
+            )
+
+    def warm(self):
+        """Starts and warms up every worker now instead of on the first render
+
+        Called while the LLM works, so the first document renders on a ready
+        worker. Returns without waiting for the workers.
+        """
+        if self._executor is not None and not self._warmed:
+            self._warmed = True
+            for _ in range(self.workers):
+                self._executor.submit(os.getpid)
+
+    def submit(self, html_content, pdf_path, jpg_path, preview_dpi: int = PREVIEW_DPI) -> Future:
+        """Queues one document and returns a future for its RenderResult"""
+        args = (html_content, str(pdf_path), str(jpg_path), preview_dpi)
+        if self._executor is not None:
+            return self._executor.submit(_render, *args)
+        future = Future()
+        try:
+            future.set_result(_render(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool() -> RenderPool:
+    """Returns the process-wide render pool, starting its workers on first use"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = RenderPool()
+            atexit.register(_render_pool.shutdown)
+        return _render_pool
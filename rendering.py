@@ -0,0 +1,270 @@
+"""
+Rendering pipeline for CV and cover letter documents
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+from preview import PREVIEW_DPI, render_preview
+from render_cache import get_render_cache
+from render_pool import get_render_pool
+from tracing import record_span, span
+
+CV_TEMPLATE_PATH = "templates/cv_template.html"
+COVER_LETTER_TEMPLATE_PATH = "templates/cover_letter_template.html"
+SHARED_STYLESHEET_PATH = "templates/shared.css"
+
+logger = logging.getLogger(__name__)
+
+_styles = threading.local()
+
+def get_shared_styles():
+    """Return the shared stylesheet and font configuration for this thread
+
+    Both are built once and reused for every render, so the common CSS is
+    parsed and the font stack resolved a single time instead of per document.
+    Like compiled templates they are keyed on the file's modification time,
+    so long-lived render workers pick up an edited stylesheet instead of
+    rendering with the old one under the new cache key. FontConfiguration is
+    not safe to share between threads, hence one per thread; render pool
+    workers only ever use one.
+    """
+    stat = os.stat(SHARED_STYLESHEET_PATH)
+    version = (stat.st_mtime_ns, stat.st_size)
+    if getattr(_styles, 'version', None) != version:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        _styles.stylesheet = CSS(filename=SHARED_STYLESHEET_PATH, font_config=font_config)
+        _styles.font_config = font_config
+        _styles.version = version
+    return _styles.stylesheet, _styles.font_config
+
+def shared_stylesheet_digest() -> str:
+    """Hash of the shared stylesheet, so cached renders follow edits to it"""
+    with open(SHARED_STYLESHEET_PATH, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+class TemplateRegistry:
+    """Process-wide cache of compiled Handlebars templates
+
+    Entries are keyed on the template path and its modification time, so an
+    edited template is recompiled on next use. The least recently used
+    entries are evicted once more than max_size templates are cached.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self._compiler = None
+
+    def get(self, template_path):
+        """Return the compiled template for a path, compiling it if needed"""
+        path = os.path.abspath(template_path)
+        key = (path, os.stat(path).st_mtime_ns)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                return template
+
+            # Drop any stale compilation of the same file before reloading
+            for stale in [k for k in self._templates if k[0] == path]:
+                del self._templates[stale]
+
+            if self._compiler is None:
+                from pybars import Compiler
+                self._compiler = Compiler()
+            with open(path, 'r') as file:
+                template = self._compiler.compile(file.read())
+            self._templates[key] = template
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+            return template
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+template_registry = TemplateRegistry()
+
+def render_template(template_path, data):
+    """Render a cached template with the given Pydantic model"""
+    template = template_registry.get(template_path)
+    return template(data.model_dump())
+
+@dataclass
+class RenderResult:
+    """Paths and timings for a single rendered document"""
+    pdf_path: str
+    jpg_path: str
+    layout_seconds: float
+    # A second layout pass is what the PDF + JPEG pair used to cost, or the
+    # whole layout when the artifacts came from the render cache
+    layout_seconds_saved: float
+    cached: bool = False
+    # (wall, cpu) seconds per render step, measured where the render ran
+    steps: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+def render_document(html_content, pdf_path, jpg_path, preview_dpi: int = PREVIEW_DPI) -> RenderResult:
+    """Lay out HTML once and write both the PDF and its first-page JPEG preview"""
+    from weasyprint import HTML
+
+    # Output paths may be hard links into the render cache, so replace them
+    # instead of writing through them
+    for path in (pdf_path, jpg_path):
+        if os.path.lexists(path):
+            os.remove(path)
+
+    stylesheet, font_config = get_shared_styles()
+    steps = {}
+    clock = (time.perf_counter(), time.thread_time())
+
+    def step(name):
+        nonlocal clock
+        now = (time.perf_counter(), time.thread_time())
+        steps[name] = (now[0] - clock[0], now[1] - clock[1])
+        clock = now
+
+    document = HTML(string=html_content).render(stylesheets=[stylesheet], font_config=font_config)
+    step('layout')
+
+    pdf = document.write_pdf()
+    with open(pdf_path, 'wb') as file:
+        file.write(pdf)
+    step('pdf')
+
+    render_preview(pdf, jpg_path, dpi=preview_dpi)
+    step('jpeg')
+
+    return RenderResult(
+        pdf_path=str(pdf_path),
+        jpg_path=str(jpg_path),
+        layout_seconds=steps['layout'][0],
+        layout_seconds_saved=steps['layout'][0],
+        steps=steps
+    )
+
+_cache_writer = None
+_cache_writer_lock = threading.Lock()
+
+def get_cache_writer() -> ThreadPoolExecutor:
+    """Returns the thread that stores finished renders in the render cache
+
+    Copying artifacts into the cache would otherwise run on the thread that
+    delivers every render pool result, holding back the results behind it.
+    """
+    global _cache_writer
+    with _cache_writer_lock:
+        if _cache_writer is None:
+            _cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='render-cache')
+        return _cache_writer
+
+def submit_model(model, template_path, pdf_path, jpg_path,
+                 preview_dpi: int = PREVIEW_DPI) -> Future:
+    """Start rendering a model to PDF and JPEG on the render pool
+
+    Identical inputs are restored from the render cache without touching the
+    pool. Returns a future for the RenderResult.
+    """
+    cache = get_render_cache()
+    key = cache.key(model, template_path, {
+        'preview_dpi': preview_dpi,
+        'shared_stylesheet': shared_stylesheet_digest()
+    })
+    future = Future()
+    meta = cache.restore(key, pdf_path, jpg_path)
+    if meta is not None:
+        future.set_result(RenderResult(
+            pdf_path=str(pdf_path),
+            jpg_path=str(jpg_path),
+            layout_seconds=0.0,
+            layout_seconds_saved=meta.get('layout_seconds', 0.0),
+            cached=True
+        ))
+        return future
+
+    with span('render.template', template=os.path.basename(template_path)):
+        html_content = render_template(template_path, model)
+
+    def store(result):
+        try:
+            cache.store(key, pdf_path, jpg_path, {'layout_seconds': result.layout_seconds})
+        except Exception:
+            # The render itself succeeded; it just will not be reused
+            logger.warning("Could not store %s in the render cache", pdf_path, exc_info=True)
+        finally:
+            future.set_result(result)
+
+    def finish(rendered):
+        try:
+            result = rendered.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        get_cache_writer().submit(store, result)
+
+    get_render_pool().submit(html_content, pdf_path, jpg_path, preview_dpi).add_done_callback(finish)
+    return future
+
+def render_model(model, template_path, pdf_path, jpg_path,
+                 preview_dpi: int = PREVIEW_DPI) -> RenderResult:
+    """Render a model to PDF and JPEG, reusing cached artifacts for identical inputs"""
+    return submit_model(model, template_path, pdf_path, jpg_path, preview_dpi).result()
+
+DOCUMENT_TEMPLATES = {
+    'cv': CV_TEMPLATE_PATH,
+    'cover_letter': COVER_LETTER_TEMPLATE_PATH
+}
+
+def document_paths(output_dir, document: str) -> Tuple[str, str]:
+    """Returns the PDF and JPEG paths of a document ('cv' or 'cover_letter')"""
+    return (os.path.join(output_dir, f"{document}.pdf"),
+            os.path.join(output_dir, f"{document}.jpg"))
+
+def submit_document(document: str, model, output_dir) -> Future:
+    """Starts rendering one document of an application as soon as its model is ready"""
+    os.makedirs(output_dir, exist_ok=True)
+    pdf_path, jpg_path = document_paths(output_dir, document)
+    return submit_model(model, DOCUMENT_TEMPLATES[document], pdf_path, jpg_path)
+
+def collect_application(futures: Dict[str, Future], output_dir) -> dict:
+    """Waits for the submitted CV and cover letter renders and reports their files"""
+    renders = {document: futures[document].result() for document in DOCUMENT_TEMPLATES}
+
+    # Steps ran in pool workers, so they are traced from the timings they report
+    for document, result in renders.items():
+        for name, (wall, cpu) in result.steps.items():
+            record_span(f"render.{name}", wall, cpu, document=document)
+
+    files = {}
+    for document in DOCUMENT_TEMPLATES:
+        pdf_path, jpg_path = document_paths(output_dir, document)
+        files[f"{document}_jpg"] = jpg_path
+        files[f"{document}_pdf"] = pdf_path
+    return {
+        "success": True,
+        "files": files,
+        "layout_seconds_saved": {
+            document: round(result.layout_seconds_saved, 3) for document, result in renders.items()
+        },
+        "render_cache": {
+            **{document: "hit" if result.cached else "miss" for document, result in renders.items()},
+            **get_render_cache().stats()
+        }
+    }
+
+def render_application(cv, cover_letter, output_dir) -> dict:
+    """Render a validated CV and cover letter to PDF and JPEG in output_dir"""
+    # Submit both documents so they lay out on separate workers
+    return collect_application({
+        'cv': submit_document('cv', cv, output_dir),
+        'cover_letter': submit_document('cover_letter', cover_letter, output_dir)
+    }, output_dir)
@@ -0,0 +1,166 @@
+"""
+Schema-guided structured output for the writer agents
+
+The writers answer with JSON that must validate against the Pydantic models.
+Instead of finding out at render time, their output is validated as soon as
+each task finishes: small violations are repaired locally, and only the
+fields that still fail are sent back to the model.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+MAX_REPROMPTS = int(os.getenv('JOB_MAX_REPROMPTS', '2'))
+
+# Repairs that can fix one error can reveal another (a trimmed item inside a
+# list that is then shortened), so validation is retried a few times
+REPAIR_PASSES = 3
+
+def parse_json_output(text: str) -> dict:
+    """
+    Parses the JSON object from an agent's final answer, ignoring code fences
+    or surrounding prose
+    """
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("No JSON object found in task output")
+    return json.loads(text[start:end + 1])
+
+def schema_instructions(model_cls: Type[BaseModel]) -> str:
+    """Compact JSON schema of a model, for use in task descriptions"""
+    return json.dumps(model_cls.model_json_schema(), separators=(',', ':'))
+
+@dataclass
+class OutputReport:
+    """What it took to turn one task's answer into a valid model"""
+    model: str
+    repairs: List[str] = field(default_factory=list)
+    reprompts: int = 0
+    reprompted_fields: List[str] = field(default_factory=list)
+
+def _trim(text: str, max_length: int) -> str:
+    """Cuts text to max_length, at a word boundary when one is close enough"""
+    text = text.strip()
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length]
+    space = cut.rfind(' ')
+    if space >= max_length * 0.6:
+        cut = cut[:space]
+    return cut.rstrip(' ,;:-')
+
+def _field_path(loc: Tuple) -> str:
+    return '.'.join(str(part) for part in loc)
+
+def _repair_error(data: Any, error: dict) -> Optional[str]:
+    """Applies the deterministic fix for one validation error, if there is one"""
+    loc = error['loc']
+    if not loc:
+        return None
+    try:
+        parent = data
+        for part in loc[:-1]:
+            parent = parent[part]
+        value = parent[loc[-1]]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    kind = error['type']
+    path = _field_path(loc)
+    if kind == 'string_too_long' and isinstance(value, str):
+        parent[loc[-1]] = _trim(value, error['ctx']['max_length'])
+        return f"{path}: trimmed to {len(parent[loc[-1]])} characters"
+    if kind == 'too_long' and isinstance(value, list):
+        max_length = error['ctx']['max_length']
+        del value[max_length:]
+        return f"{path}: dropped items beyond {max_length}"
+    if kind == 'string_type' and isinstance(value, (int, float)) and not isinstance(value, bool):
+        parent[loc[-1]] = str(value)
+        return f"{path}: converted {type(value).__name__} to string"
+    return None
+
+def repair(data: dict, model_cls: Type[BaseModel]) -> Tuple[Optional[BaseModel], List[str], List[dict]]:
+    """Validates data, fixing length and type violations that need no judgement
+
+    Returns the model (or None), the repairs that were applied and the
+    validation errors that are left. data is modified in place.
+    """
+    repairs = []
+    errors = []
+    for _ in range(REPAIR_PASSES):
+        try:
+            return model_cls.model_validate(data), repairs, []
+        except ValidationError as e:
+            errors = e.errors()
+        # Deepest locations first, so shortening a list never shifts the
+        # index of an item that still has to be fixed
+        applied = [_repair_error(data, error) for error in sorted(errors, key=lambda e: -len(e['loc']))]
+        applied = [note for note in applied if note]
+        if not applied:
+            break
+        repairs.extend(applied)
+    try:
+        return model_cls.model_validate(data), repairs, []
+    except ValidationError as e:
+        return None, repairs, e.errors()
+
+def _reprompt(llm, model_cls: Type[BaseModel], data: dict, errors: List[dict]) -> dict:
+    """Asks the model to correct only the top-level fields that failed validation"""
+    fields = sorted({str(error['loc'][0]) for error in errors})
+    schema = model_cls.model_json_schema()
+    properties = {name: schema['properties'][name] for name in fields if name in schema['properties']}
+    field_schema = {'type': 'object', 'properties': properties, 'required': fields}
+    if '$ref' in json.dumps(properties) and '$defs' in schema:
+        field_schema['$defs'] = schema['$defs']
+
+    problems = "\n".join(f"- {_field_path(error['loc'])}: {error['msg']}" for error in errors)
+    current = {name: data[name] for name in fields if name in data}
+    prompt = (
+        f"These fields of a {model_cls.__name__} JSON object failed validation:\n{problems}\n\n"
+        f"Current values:\n{json.dumps(current, indent=2, default=str)}\n\n"
+        f"JSON schema for the fields:\n{json.dumps(field_schema, separators=(',', ':'))}\n\n"
+        "Return a JSON object with only these fields, corrected so they satisfy the schema. "
+        "Keep the wording wherever the errors allow it."
+    )
+    message = llm.bind(response_format={'type': 'json_object'}).invoke(prompt)
+    patch = parse_json_output(message.content)
+    return {name: value for name, value in patch.items() if name in fields}
+
+def validate_output(text: str, model_cls: Type[BaseModel], llm=None,
+                    max_reprompts: int = MAX_REPROMPTS) -> Tuple[BaseModel, OutputReport]:
+    """Turns an agent's JSON answer into a valid model
+
+    Length and type violations are repaired locally first. Whatever still
+    fails is re-prompted field by field, up to max_reprompts times, instead
+    of re-running the whole task. Raises ValidationError when the output
+    cannot be made valid.
+    """
+    data = parse_json_output(text)
+    report = OutputReport(model=model_cls.__name__)
+    while True:
+        model, repairs, errors = repair(data, model_cls)
+        report.repairs.extend(repairs)
+        if model is not None:
+            return model, report
+        if llm is None or report.reprompts >= max_reprompts or not all(error['loc'] for error in errors):
+            # Validate once more to raise the remaining errors
+            return model_cls.model_validate(data), report
+        patch = _reprompt(llm, model_cls, data, errors)
+        report.reprompts += 1
+        report.reprompted_fields.extend(name for name in patch if name not in report.reprompted_fields)
+        data.update(patch)
+
+def format_output_stats(reports: Dict[str, OutputReport], token_usage: Dict[str, int]) -> str:
+    """Summarizes repairs, re-prompts and token usage for one application"""
+    lines = []
+    for report in reports.values():
+        lines.append(f"{report.model}: {len(report.repairs)} local repairs, {report.reprompts} re-prompts"
+                     + (f" ({', '.join(report.reprompted_fields)})" if report.reprompted_fields else ""))
+    if token_usage:
+        lines.append(f"tokens: {token_usage['total_tokens']} ({token_usage['prompt_tokens']} prompt, "
+                     f"{token_usage['completion_tokens']} completion) in {token_usage['requests']} requests")
+    return "\n".join(lines)
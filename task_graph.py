@@ -0,0 +1,90 @@
+"""
+Dependency-aware execution of crew tasks
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+@dataclass
+class TaskTiming:
+    """Wall-clock timing of one task, relative to the start of the graph run"""
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+def run_task_graph(tasks: list, names: Optional[List[str]] = None,
+                   execute: Optional[Callable] = None,
+                   max_workers: Optional[int] = None) -> List[TaskTiming]:
+    """Runs tasks as soon as every task in their ``context`` has finished
+
+    Tasks that do not depend on each other run concurrently, so the total
+    latency follows the critical path of the graph rather than the sum of
+    all tasks. ``execute`` defaults to ``task.execute()``, which builds the
+    context from the upstream outputs itself. Each task runs in a copy of
+    the caller's context, so context-scoped callbacks such as token counters
+    see every task. The first failure stops new tasks from being scheduled
+    and is re-raised once running tasks finish.
+    """
+    names = names or [f"task_{i}" for i in range(len(tasks))]
+    execute = execute or (lambda task: task.execute())
+    index = {id(task): i for i, task in enumerate(tasks)}
+
+    dependencies: Dict[int, set] = {}
+    dependents: Dict[int, list] = {i: [] for i in range(len(tasks))}
+    for i, task in enumerate(tasks):
+        upstream = {index[id(dep)] for dep in (task.context or []) if id(dep) in index}
+        dependencies[i] = upstream
+        for dep in upstream:
+            dependents[dep].append(i)
+
+    timings: Dict[int, TaskTiming] = {}
+    origin = time.perf_counter()
+
+    def timed(i):
+        started = time.perf_counter() - origin
+        try:
+            execute(tasks[i])
+        finally:
+            timings[i] = TaskTiming(names[i], started, time.perf_counter() - origin)
+
+    def submit(executor, i):
+        return executor.submit(contextvars.copy_context().run, timed, i)
+
+    remaining = {i: len(deps) for i, deps in dependencies.items()}
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks) or 1) as executor:
+        running = {submit(executor, i): i for i, count in remaining.items() if count == 0}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                for dependent in dependents[i]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and error is None:
+                        running[submit(executor, dependent)] = dependent
+
+    if error is not None:
+        raise error
+    if len(timings) != len(tasks):
+        raise ValueError("Task context dependencies contain a cycle")
+    return [timings[i] for i in sorted(timings)]
+
+def format_timings(timings: List[TaskTiming]) -> str:
+    """Formats task timings as a small table for console output"""
+    lines = [f"{'task':<28} {'start':>8} {'end':>8} {'seconds':>8}"]
+    for timing in timings:
+        lines.append(f"{timing.name:<28} {timing.started:>8.1f} {timing.finished:>8.1f} {timing.seconds:>8.1f}")
+    if timings:
+        total = max(t.finished for t in timings)
+        sequential = sum(t.seconds for t in timings)
+        lines.append(f"total {total:.1f}s (sequential would be {sequential:.1f}s)")
+    return "\n".join(lines)
@@ -1,12 +1,10 @@
 import os
 from datetime import datetime, date
-from pybars import Compiler
-from weasyprint import HTML
 from pathlib import Path
-from PIL import Image
-import io
 import json
 from models import CV, CoverLetter
+from rendering import render_template
+from render_pool import get_render_pool
 
 def load_cv_data(file_path: str) -> CV:
     """Load CV data from JSON file"""
@@ -42,32 +40,6 @@ def load_cover_letter_data(file_path: str, job_details: dict = None) -> CoverLet
     
     return CoverLetter(**data)
 
-def render_template(template_path, data):
-    """Render HTML template with given data"""
-    with open(template_path, 'r') as file:
-        template_content = file.read()
-    
-    compiler = Compiler()
-    template = compiler.compile(template_content)
-    return template(data.model_dump())
-
-def html_to_jpeg(html_content, output_path):
-    """Convert HTML content to JPEG using WeasyPrint and PIL"""
-    # Create PDF in memory
-    pdf = HTML(string=html_content).write_pdf()
-    
-    # Convert PDF to PIL Image
-    from pdf2image import convert_from_bytes
-    images = convert_from_bytes(pdf)
-    
-    # Save first page as JPEG
-    if images:
-        images[0].save(output_path, 'JPEG', quality=95)
-
-def html_to_pdf(html_content, output_path):
-    """Convert HTML content to PDF using WeasyPrint"""
-    HTML(string=html_content).write_pdf(output_path)
-
 def main():
     # Sample job details (you can modify these or load from a file)
     job_details = {
@@ -80,36 +52,37 @@ def main():
     # Create test output directory
     output_dir = Path("templates/test_output")
     output_dir.mkdir(exist_ok=True)
+    render_pool = get_render_pool()
     
     # Load and process CV
     cv_data = load_cv_data("CV.txt")
     cv_template_path = "templates/cv_template.html"
     cv_html = render_template(cv_template_path, cv_data)
     
-    # Save CV as JPEG
+    # Queue CV JPEG and PDF from a single layout on the render pool
     cv_jpg_path = output_dir / "test_cv.jpg"
-    html_to_jpeg(cv_html, str(cv_jpg_path))
-    print(f"CV saved to: {cv_jpg_path}")
-    
-    # Save CV as PDF
     cv_pdf_path = output_dir / "test_cv.pdf"
-    html_to_pdf(cv_html, str(cv_pdf_path))
-    print(f"CV PDF saved to: {cv_pdf_path}")
+    cv_future = render_pool.submit(cv_html, cv_pdf_path, cv_jpg_path)
     
     # Load and process Cover Letter
     cover_letter_data = load_cover_letter_data("Cover_Letter.txt", job_details)
     cl_template_path = "templates/cover_letter_template.html"
     cl_html = render_template(cl_template_path, cover_letter_data)
     
-    # Save Cover Letter as JPEG
+    # Queue Cover Letter JPEG and PDF alongside the CV
     cl_jpg_path = output_dir / "test_cover_letter.jpg"
-    html_to_jpeg(cl_html, str(cl_jpg_path))
-    print(f"Cover Letter saved to: {cl_jpg_path}")
-    
-    # Save Cover Letter as PDF
     cl_pdf_path = output_dir / "test_cover_letter.pdf"
-    html_to_pdf(cl_html, str(cl_pdf_path))
+    cl_future = render_pool.submit(cl_html, cl_pdf_path, cl_jpg_path)
+    
+    cv_render = cv_future.result()
+    print(f"CV saved to: {cv_jpg_path}")
+    print(f"CV PDF saved to: {cv_pdf_path}")
+    print(f"CV layout time saved: {cv_render.layout_seconds_saved:.3f}s")
+    
+    cl_render = cl_future.result()
+    print(f"Cover Letter saved to: {cl_jpg_path}")
     print(f"Cover Letter PDF saved to: {cl_pdf_path}")
+    print(f"Cover Letter layout time saved: {cl_render.layout_seconds_saved:.3f}s")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Lightweight tracing of wall time, CPU time and LLM tokens per pipeline stage
+"""
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional
+
+@dataclass
+class Span:
+    """One timed stage of a run; tokens are those of LLM calls made directly in it"""
+    trace_id: str
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    started: float
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    llm_calls: int = 0
+    attributes: dict = field(default_factory=dict)
+
+class Tracer:
+    """Collects the spans of one run
+
+    Spans are opened with ``span()`` in any thread that inherits the
+    tracer's context. ``started`` is relative to the tracer's creation, and
+    CPU time is that of the thread running the span.
+    """
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex[:12]
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def new_span(self, name: str, parent: Optional[Span], attributes: dict) -> Span:
+        return Span(self.trace_id, next(self._ids), parent.span_id if parent else None, name,
+                    time.perf_counter() - self._origin, attributes=attributes)
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, dict]:
+        """Totals per span name, in the order the names first finished"""
+        return summarize(self.spans)
+
+    def export_jsonl(self, path: str):
+        """Appends every span to a JSON lines file"""
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, 'a') as file:
+            for span in spans:
+                file.write(json.dumps(asdict(span)) + '\n')
+
+_tracer = contextvars.ContextVar('tracer', default=None)
+_span = contextvars.ContextVar('span', default=None)
+
+@contextlib.contextmanager
+def trace(tracer: Tracer):
+    """Makes tracer collect the spans opened in this context"""
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """Times a stage under the current span; a no-op outside ``trace()``"""
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = tracer.new_span(name, _span.get(), attributes)
+    token = _span.set(current)
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        current.wall_seconds = time.perf_counter() - wall
+        current.cpu_seconds = time.thread_time() - cpu
+        _span.reset(token)
+        tracer.add(current)
+
+def record_span(name: str, wall_seconds: float, cpu_seconds: float = 0.0, **attributes):
+    """Adds an already measured stage, such as one timed in a worker process"""
+    tracer = _tracer.get()
+    if tracer is None:
+        return
+    recorded = tracer.new_span(name, _span.get(), attributes)
+    recorded.started -= wall_seconds
+    recorded.wall_seconds = wall_seconds
+    recorded.cpu_seconds = cpu_seconds
+    tracer.add(recorded)
+
+def add_tokens(prompt_tokens: int, completion_tokens: int):
+    """Attributes one LLM call's token usage to the current span"""
+    current = _span.get()
+    tracer = _tracer.get()
+    if current is None or tracer is None:
+        return
+    with tracer._lock:
+        current.prompt_tokens += prompt_tokens
+        current.completion_tokens += completion_tokens
+        current.llm_calls += 1
+
+@functools.lru_cache(maxsize=None)
+def token_callback() -> "BaseCallbackHandler":
+    """A LangChain callback that feeds every LLM call's usage into the current span"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class SpanTokenHandler(BaseCallbackHandler):
+        def __init__(self):
+            # Streamed responses report no usage, so their tokens are counted
+            # here per call: (prompt estimate, tokens received)
+            self.streamed = {}
+
+        def on_chat_model_start(self, serialized, messages, run_id=None, **kwargs):
+            if (serialized or {}).get('kwargs', {}).get('streaming'):
+                from condense import count_tokens
+                prompt = "\n".join(str(message.content) for batch in messages for message in batch)
+                self.streamed[run_id] = [count_tokens(prompt), 0]
+
+        def on_llm_new_token(self, token, run_id=None, **kwargs):
+            if run_id in self.streamed:
+                self.streamed[run_id][1] += 1
+
+        def on_llm_end(self, response, run_id=None, **kwargs):
+            usage = (response.llm_output or {}).get('token_usage') or {}
+            streamed = self.streamed.pop(run_id, None)
+            if not usage and streamed and streamed[1]:
+                usage = {'prompt_tokens': streamed[0], 'completion_tokens': streamed[1]}
+            # Cache hits carry no llm_output and cost nothing, so they are
+            # not counted as calls either
+            if usage:
+                add_tokens(usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0))
+
+        def on_llm_error(self, error, run_id=None, **kwargs):
+            self.streamed.pop(run_id, None)
+
+    return SpanTokenHandler()
+
+def summarize(spans: Iterable[Span]) -> Dict[str, dict]:
+    """Aggregates spans by name"""
+    totals: Dict[str, dict] = {}
+    for item in spans:
+        total = totals.setdefault(item.name, {
+            'count': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+            'prompt_tokens': 0, 'completion_tokens': 0, 'llm_calls': 0
+        })
+        total['count'] += 1
+        total['wall_seconds'] += item.wall_seconds
+        total['cpu_seconds'] += item.cpu_seconds
+        total['prompt_tokens'] += item.prompt_tokens
+        total['completion_tokens'] += item.completion_tokens
+        total['llm_calls'] += item.llm_calls
+    return totals
+
+def merge_summaries(summaries: Iterable[Dict[str, dict]]) -> Dict[str, dict]:
+    """Adds up per-run summaries, e.g. for a whole batch"""
+    merged: Dict[str, dict] = {}
+    for summary in summaries:
+        for name, total in summary.items():
+            target = merged.setdefault(name, dict.fromkeys(total, 0))
+            for key, value in total.items():
+                target[key] += value
+    return merged
+
+def token_usage(summary: Dict[str, dict]) -> Dict[str, int]:
+    """Total LLM usage of a trace summary, including estimates for streamed calls"""
+    prompt_tokens = sum(total['prompt_tokens'] for total in summary.values())
+    completion_tokens = sum(total['completion_tokens'] for total in summary.values())
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+        'requests': sum(total['llm_calls'] for total in summary.values())
+    }
+
+def format_summary(summary: Dict[str, dict]) -> str:
+    """Formats a trace summary as a table for console output"""
+    lines = [f"{'stage':<28} {'count':>5} {'wall s':>8} {'cpu s':>8} {'tokens in':>10} {'tokens out':>10}"]
+    for name, total in summary.items():
+        lines.append(f"{name:<28} {total['count']:>5} {total['wall_seconds']:>8.2f} {total['cpu_seconds']:>8.2f} "
+                     f"{total['prompt_tokens']:>10} {total['completion_tokens']:>10}")
+    lines.append(f"total tokens {sum(t['prompt_tokens'] for t in summary.values())} in, "
+                 f"{sum(t['completion_tokens'] for t in summary.values())} out")
+    return "\n".join(lines)